@@ -21,18 +21,18 @@ estimated_rover_pos = None  # Will store the estimated rover position
 distances = []  # Will store distances from drones to rover
 running = False
 show_all_solutions = True  # Whether to show both possible rover positions
+last_state = None  # Inputs of the last drawn frame
+REDRAW_DELAY_MS = 30  # Slider moves within this window are coalesced into one redraw
 
 def calculate_distance(pos1, pos2):
     """Calculate Euclidean distance between two points"""
-    return np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
+    return math.hypot(pos1[0] - pos2[0], pos1[1] - pos2[1])
 
 def simulate_signal_time_of_flight(drone_position, rover_position):
     """Simulate sending and receiving a signal between drone and rover"""
-    # Calculate the distance between the drone and the rover
-    distance = calculate_distance(drone_position, rover_position)
-    # Simulate the round-trip time for the signal
-    round_trip_time = distance / SPEED_OF_SOUND
-    return round_trip_time * SPEED_OF_SOUND / 2  # One-way distance
+    # The round-trip time (distance / SPEED_OF_SOUND) is converted straight back
+    # with SPEED_OF_SOUND, so the two factors cancel
+    return calculate_distance(drone_position, rover_position) / 2  # One-way distance
 
 def localize_rover(drone1, drone2, r1, r2):
     """
@@ -45,150 +45,114 @@ def localize_rover(drone1, drone2, r1, r2):
     r2: distance from drone2 to rover
     
     Returns:
-    Two possible solutions as [(x_sol1, y_sol1), (x_sol2, y_sol2)]
+    Two possible solutions as a (2, 2) array [[x_sol1, y_sol1], [x_sol2, y_sol2]]
     """
-    x1, y1 = drone1
-    x2, y2 = drone2
+    p1 = np.asarray(drone1, dtype=float)
+    p2 = np.asarray(drone2, dtype=float)
     
-    # Distance between drones
-    a = calculate_distance(drone1, drone2)
-    
-    # Check if solution exists
-    if abs(r1 - r2) > a or r1 + r2 < a:
-        print("No solution exists: drone distances are incompatible")
-        return None
-    
-    # Calculate rover position using law of cosines and coordinate geometry
     # We're solving for the intersection of two circles:
     # Circle 1: center at drone1, radius r1
     # Circle 2: center at drone2, radius r2
+    diff = p2 - p1
+    d_squared = diff @ diff
+    d = np.sqrt(d_squared)
     
-    # Calculate intermediate values
-    d_squared = (x2 - x1)**2 + (y2 - y1)**2
-    d = math.sqrt(d_squared)
-    
-    # Using the law of cosines
-    cos_angle = (r1**2 + d_squared - r2**2) / (2 * r1 * d)
-    
-    # Clamp cos_angle to [-1, 1] to handle floating point errors
-    cos_angle = max(-1, min(1, cos_angle))
-    
-    # Distance from drone1 to the point on the line between drones where the height to the rover begins
-    l = r1 * cos_angle
-    
-    # Normalized vector from drone1 to drone2
-    if d > 0:
-        ex = (x2 - x1) / d
-        ey = (y2 - y1) / d
-    else:
-        # If drones are at the same position (should not happen in practice)
+    # Check if solution exists (drones at the same position never have one)
+    if d == 0 or abs(r1 - r2) > d or r1 + r2 < d:
+        print("No solution exists: drone distances are incompatible")
         return None
     
-    # Calculate the point on the line between drones
-    p_x = x1 + l * ex
-    p_y = y1 + l * ey
+    inv_d = 1.0 / d
     
-    # Height of the triangle (distance from the rover to the line between drones)
-    h_squared = r1**2 - l**2
-    
-    # Handle the case where h_squared is slightly negative due to numerical precision
-    if h_squared < 0 and h_squared > -1e-10:
-        h_squared = 0
-    
-    h = math.sqrt(h_squared)
+    # Distance from drone1 to the point on the line between drones where the height to the rover begins
+    a = (r1 * r1 - r2 * r2 + d_squared) * (0.5 * inv_d)
     
-    # Unit vector perpendicular to the line between drones
-    nx = -ey
-    ny = ex
+    # Height of the triangle (distance from the rover to the line between drones),
+    # clamped at zero to absorb floating point error when the circles are tangent
+    h = np.sqrt(np.maximum(r1 * r1 - a * a, 0.0))
     
-    # Calculate the two possible rover positions
-    rover_pos1 = (p_x + h * nx, p_y + h * ny)
-    rover_pos2 = (p_x - h * nx, p_y - h * ny)
+    # Point on the line between drones and the unit vector perpendicular to it
+    p = p1 + (a * inv_d) * diff
+    perp = np.array([-diff[1], diff[0]]) * inv_d
     
-    return [rover_pos1, rover_pos2]
+    # The two possible rover positions
+    return np.stack([p + h * perp, p - h * perp])
 
 def update_plot():
     """Update the plot with current drone and rover positions"""
-    ax.clear()
+    global legend_shown, last_state
     
-    # Set plot limits and labels
-    ax.set_xlim(-10, 10)
-    ax.set_ylim(-10, 10)
-    ax.set_xlabel('X Coordinate (m)')
-    ax.set_ylabel('Y Coordinate (m)')
-    ax.set_title('Rover Localization with Two Drones')
+    # Nothing to do if the inputs are the same as the last drawn frame
+    state = (drone1_pos, drone2_pos, real_rover_pos, show_all_solutions)
+    if state == last_state:
+        return
+    last_state = state
     
-    # Plot the drones
-    ax.scatter(drone1_pos[0], drone1_pos[1], color='blue', s=100, marker='o', label='Drone 1', zorder=10)
-    ax.scatter(drone2_pos[0], drone2_pos[1], color='green', s=100, marker='o', label='Drone 2', zorder=10)
+    # Move the drones and the actual rover position
+    drone1_marker.set_offsets([drone1_pos])
+    drone2_marker.set_offsets([drone2_pos])
+    rover_marker.set_offsets([real_rover_pos])
     
-    # Plot the actual rover position
-    ax.scatter(real_rover_pos[0], real_rover_pos[1], color='red', s=200, marker='*', label='Actual Rover', zorder=10)
-    
-    # Calculate and plot distances from drones to rover
+    # Calculate distances from drones to rover
     r1 = calculate_distance(drone1_pos, real_rover_pos)
     r2 = calculate_distance(drone2_pos, real_rover_pos)
     
-    # Plot distance circles
-    circle1 = plt.Circle(drone1_pos, r1, fill=False, color='blue', linestyle='--', alpha=0.5)
-    circle2 = plt.Circle(drone2_pos, r2, fill=False, color='green', linestyle='--', alpha=0.5)
-    ax.add_patch(circle1)
-    ax.add_patch(circle2)
+    # Update distance circles
+    circle1.center = drone1_pos
+    circle1.set_radius(r1)
+    circle2.center = drone2_pos
+    circle2.set_radius(r2)
     
-    # Plot lines connecting drones to rover
-    ax.plot([drone1_pos[0], real_rover_pos[0]], [drone1_pos[1], real_rover_pos[1]], 'b--', alpha=0.5)
-    ax.plot([drone2_pos[0], real_rover_pos[0]], [drone2_pos[1], real_rover_pos[1]], 'g--', alpha=0.5)
+    # Update lines connecting drones to rover
+    line1.set_data([drone1_pos[0], real_rover_pos[0]], [drone1_pos[1], real_rover_pos[1]])
+    line2.set_data([drone2_pos[0], real_rover_pos[0]], [drone2_pos[1], real_rover_pos[1]])
     
-    # Add distance labels
+    # Update distance labels
     midpoint1 = ((drone1_pos[0] + real_rover_pos[0])/2, (drone1_pos[1] + real_rover_pos[1])/2)
     midpoint2 = ((drone2_pos[0] + real_rover_pos[0])/2, (drone2_pos[1] + real_rover_pos[1])/2)
-    ax.text(midpoint1[0], midpoint1[1], f'R1 = {r1:.2f}m', 
-            fontsize=9, ha='center', va='center',
-            bbox=dict(facecolor='white', alpha=0.7))
-    ax.text(midpoint2[0], midpoint2[1], f'R2 = {r2:.2f}m', 
-            fontsize=9, ha='center', va='center',
-            bbox=dict(facecolor='white', alpha=0.7))
+    text_r1.set_position(midpoint1)
+    text_r1.set_text(f'R1 = {r1:.2f}m')
+    text_r2.set_position(midpoint2)
+    text_r2.set_text(f'R2 = {r2:.2f}m')
     
     # Calculate the estimated rover position
     solutions = localize_rover(drone1_pos, drone2_pos, r1, r2)
+    has_solution = solutions is not None
     
-    if solutions:
-        # Plot the estimated rover position(s)
-        for i, solution in enumerate(solutions):
-            if i == 0 or show_all_solutions:
-                solution_color = 'purple' if i == 0 else 'orange'
-                solution_label = 'Estimated Rover' if i == 0 else 'Alternative Position'
-                ax.scatter(solution[0], solution[1], color=solution_color, s=150, marker='x', 
-                          label=solution_label, zorder=5)
-                
-                # Plot error lines
-                if i == 0:  # Only for the first solution
-                    ax.plot([solution[0], real_rover_pos[0]], 
-                            [solution[1], real_rover_pos[1]], 
-                            'r-', alpha=0.5, linewidth=1)
-                    
-                    # Calculate and display error
-                    error = calculate_distance(solution, real_rover_pos)
-                    error_text = f'Error: {error:.2f}m'
-                    ax.text(0, 9, error_text, fontsize=12, ha='center',
-                            bbox=dict(facecolor='white', alpha=0.7))
+    if has_solution:
+        # Move the estimated rover position(s)
+        estimate_marker.set_offsets(solutions[:1])
+        alternative_marker.set_offsets(solutions[1:])
+        
+        # Update error line and error text for the first solution
+        error_line.set_data([solutions[0][0], real_rover_pos[0]], [solutions[0][1], real_rover_pos[1]])
+        error = calculate_distance(solutions[0], real_rover_pos)
+        error_label.set_text(f'Error: {error:.2f}m')
         
-        # Plot the distance between drones
-        ax.plot([drone1_pos[0], drone2_pos[0]], [drone1_pos[1], drone2_pos[1]], 'k-', alpha=0.7)
+        # Update the distance between drones
+        baseline.set_data([drone1_pos[0], drone2_pos[0]], [drone1_pos[1], drone2_pos[1]])
         drone_dist = calculate_distance(drone1_pos, drone2_pos)
         drone_mid = ((drone1_pos[0] + drone2_pos[0])/2, (drone1_pos[1] + drone2_pos[1])/2)
-        ax.text(drone_mid[0], drone_mid[1] - 0.5, f'A = {drone_dist:.2f}m', 
-                fontsize=9, ha='center', va='center',
-                bbox=dict(facecolor='white', alpha=0.7))
+        text_a.set_position((drone_mid[0], drone_mid[1] - 0.5))
+        text_a.set_text(f'A = {drone_dist:.2f}m')
     
-    # Add grid for better visualization
-    ax.grid(True, linestyle='--', alpha=0.5)
+    for artist in (estimate_marker, error_line, error_label, baseline, text_a):
+        artist.set_visible(has_solution)
+    alternative_marker.set_visible(has_solution and show_all_solutions)
     
-    # Add legend
-    ax.legend(loc='lower right')
+    # Rebuild the legend only when the set of shown markers changes
+    shown = tuple(h.get_visible() for h in legend_handles)
+    if shown != legend_shown:
+        ax.legend(handles=[h for h in legend_handles if h.get_visible()], loc='lower right')
+        legend_shown = shown
     
     # Draw the updated plot
-    fig.canvas.draw()
+    fig.canvas.draw_idle()
+
+def schedule_update():
+    """Redraw once the sliders have been still for REDRAW_DELAY_MS"""
+    redraw_timer.stop()
+    redraw_timer.start()
 
 def start_simulation(event):
     """Start the simulation with random rover position"""
@@ -209,30 +173,66 @@ def update_drone1_x(val):
     """Update x-position of drone 1"""
     global drone1_pos
     drone1_pos = (val, drone1_pos[1])
-    update_plot()
+    schedule_update()
 
 def update_drone1_y(val):
     """Update y-position of drone 1"""
     global drone1_pos
     drone1_pos = (drone1_pos[0], val)
-    update_plot()
+    schedule_update()
 
 def update_drone2_x(val):
     """Update x-position of drone 2"""
     global drone2_pos
     drone2_pos = (val, drone2_pos[1])
-    update_plot()
+    schedule_update()
 
 def update_drone2_y(val):
     """Update y-position of drone 2"""
     global drone2_pos
     drone2_pos = (drone2_pos[0], val)
-    update_plot()
+    schedule_update()
 
 # Create figure and axes
 fig, ax = plt.subplots(figsize=(10, 10))
 plt.subplots_adjust(bottom=0.3)
 
+# Set plot limits and labels
+ax.set_xlim(-10, 10)
+ax.set_ylim(-10, 10)
+ax.set_xlabel('X Coordinate (m)')
+ax.set_ylabel('Y Coordinate (m)')
+ax.set_title('Rover Localization with Two Drones')
+
+# Add grid for better visualization
+ax.grid(True, linestyle='--', alpha=0.5)
+
+# Create the plot artists once; update_plot only moves them
+drone1_marker = ax.scatter(*drone1_pos, color='blue', s=100, marker='o', label='Drone 1', zorder=10)
+drone2_marker = ax.scatter(*drone2_pos, color='green', s=100, marker='o', label='Drone 2', zorder=10)
+rover_marker = ax.scatter(*real_rover_pos, color='red', s=200, marker='*', label='Actual Rover', zorder=10)
+estimate_marker = ax.scatter(0, 0, color='purple', s=150, marker='x', label='Estimated Rover', zorder=5)
+alternative_marker = ax.scatter(0, 0, color='orange', s=150, marker='x', label='Alternative Position', zorder=5)
+legend_handles = [drone1_marker, drone2_marker, rover_marker, estimate_marker, alternative_marker]
+legend_shown = None  # Visibility of legend_handles when the legend was last built
+
+circle1 = ax.add_patch(plt.Circle(drone1_pos, 0, fill=False, color='blue', linestyle='--', alpha=0.5))
+circle2 = ax.add_patch(plt.Circle(drone2_pos, 0, fill=False, color='green', linestyle='--', alpha=0.5))
+line1, = ax.plot([], [], 'b--', alpha=0.5)
+line2, = ax.plot([], [], 'g--', alpha=0.5)
+error_line, = ax.plot([], [], 'r-', alpha=0.5, linewidth=1)
+baseline, = ax.plot([], [], 'k-', alpha=0.7)
+
+text_r1 = ax.text(0, 0, '', fontsize=9, ha='center', va='center', bbox=dict(facecolor='white', alpha=0.7))
+text_r2 = ax.text(0, 0, '', fontsize=9, ha='center', va='center', bbox=dict(facecolor='white', alpha=0.7))
+text_a = ax.text(0, 0, '', fontsize=9, ha='center', va='center', bbox=dict(facecolor='white', alpha=0.7))
+error_label = ax.text(0, 9, '', fontsize=12, ha='center', bbox=dict(facecolor='white', alpha=0.7))
+
+# One-shot timer used to debounce slider callbacks
+redraw_timer = fig.canvas.new_timer(interval=REDRAW_DELAY_MS)
+redraw_timer.single_shot = True
+redraw_timer.add_callback(update_plot)
+
 # Create buttons
 ax_start = plt.axes([0.6, 0.05, 0.3, 0.05])
 ax_toggle = plt.axes([0.1, 0.05, 0.3, 0.05])
@@ -5,9 +5,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox
+from matplotlib.collections import LineCollection
 import random
 import math
 from scipy.optimize import least_squares
+from scipy.linalg import cho_factor, cho_solve
+from scipy.spatial.distance import cdist
 
 # Constants
 GAMMA = 1.4
@@ -15,133 +18,180 @@ R_GAS = 287.05
 TEMPERATURE = 25
 SPEED_OF_SOUND = np.sqrt(GAMMA * R_GAS * (TEMPERATURE + 273.15))
 NUM_DRONES = 7
+TIKHONOV_FACTOR = 1e-6  # Ridge strength relative to the largest singular value
+MAX_CONDITION_NUMBER = 1e6  # Above this the linear system is too ill-posed to trust LM alone
+LINEAR_RESIDUAL_TOLERANCE = 1e-2  # Linear solutions this close to every circle skip LM refinement
 
 # Global variables
-drone_positions = []
+drone_positions = np.empty((0, 2))
 real_rover_pos = (0, 3)
 estimated_rover_pos = None
+last_estimate = None  # Last accepted solution, used to warm-start the next solve
 running = False
 
-def calculate_distance(pos1, pos2):
-    return np.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
-
 def simulate_signal_time_of_flight(drone_position, rover_position):
-    distance = calculate_distance(drone_position, rover_position)
+    distance = math.dist(drone_position, rover_position)
     round_trip_time = distance / SPEED_OF_SOUND
     return round_trip_time * SPEED_OF_SOUND / 2
 
 def objective_function(point, drone_positions, distances):
-    x, y = point
-    return [calculate_distance((x, y), drone_positions[i]) - distances[i] for i in range(len(drone_positions))]
+    # Residual of every drone at once; drone_positions is an (N, 2) array
+    return np.linalg.norm(drone_positions - point, axis=1) - distances
+
+def objective_jacobian(point, drone_positions, distances):
+    # d/dpoint of |point - P_i| is the unit vector from P_i towards point
+    diff = point - drone_positions
+    ranges = np.linalg.norm(diff, axis=1)
+    return diff / np.where(ranges > 0, ranges, 1.0)[:, np.newaxis]
+
+def build_linear_system(drone_positions, distances):
+    # Subtracting drone 0's circle equation from the others cancels the |x|^2 term,
+    # leaving the linear system 2 (P_i - P_0) . x = |P_i|^2 - |P_0|^2 - d_i^2 + d_0^2
+    p0 = drone_positions[0]
+    A = 2 * (drone_positions[1:] - p0)
+    b = (drone_positions[1:]**2).sum(axis=1) - p0 @ p0 - distances[1:]**2 + distances[0]**2
+    return A, b
+
+def linearized_multilateration(drone_positions, distances):
+    A, b = build_linear_system(drone_positions, distances)
+    # Tikhonov-damped normal equations (A^T A + lam^2 I) x = A^T b, so near-collinear
+    # drones give a bounded estimate; trace(A^T A) >= sigma_max^2 sets the ridge scale.
+    # With only 2 unknowns a Cholesky solve is far cheaper than an SVD.
+    AtA = A.T @ A
+    AtA += TIKHONOV_FACTOR**2 * np.trace(AtA) * np.eye(A.shape[1])
+    try:
+        return cho_solve(cho_factor(AtA), A.T @ b)
+    except np.linalg.LinAlgError:
+        result, _, _, _ = np.linalg.lstsq(A, b, rcond=None)
+        return result
 
 def localize_rover_multilateration(drone_positions, distances):
-    x_avg = sum(pos[0] for pos in drone_positions) / len(drone_positions)
-    y_avg = sum(pos[1] for pos in drone_positions) / len(drone_positions)
-    initial_guess = [x_avg, y_avg]
+    global last_estimate
+    drone_positions = np.asarray(drone_positions, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+
+    # The closed-form linear solution is a far better starting point than the centroid;
+    # it needs at least 3 drones to pin down x and y
+    if len(drone_positions) >= 3:
+        initial_guess = linearized_multilateration(drone_positions, distances)
+        # Already on every circle within tolerance: LM has nothing left to refine
+        residuals = objective_function(initial_guess, drone_positions, distances)
+        if np.max(np.abs(residuals)) < LINEAR_RESIDUAL_TOLERANCE:
+            last_estimate = initial_guess
+            return tuple(initial_guess)
+    elif last_estimate is not None:
+        # Too few drones for the linear solve; the rover rarely moves far between updates,
+        # and starting from the last answer keeps LM on the same side of the drone pair
+        initial_guess = last_estimate
+    else:
+        initial_guess = drone_positions.mean(axis=0)
 
     result = least_squares(
         objective_function,
         initial_guess,
+        jac=objective_jacobian,
         args=(drone_positions, distances),
         method='lm'
     )
 
     if result.success:
+        last_estimate = result.x
         return tuple(result.x)
     else:
         print("Failed to converge on a solution")
-        return initial_guess
+        return tuple(initial_guess)
 
-def circle_circle_intersections(c1, r1, c2, r2):
-    """Return intersection points between two circles (if they exist)"""
-    x0, y0 = c1
-    x1, y1 = c2
-    dx, dy = x1 - x0, y1 - y0
-    d = math.hypot(dx, dy)
+def circle_circle_intersections(drone_positions, distances):
+    """Return the intersection points of every pair of circles as an (M, 2) array"""
+    i, j = np.triu_indices(len(drone_positions), k=1)
+    r1, r2 = distances[i], distances[j]
+    diff = drone_positions[j] - drone_positions[i]
+    d = np.linalg.norm(diff, axis=1)
 
-    if d > r1 + r2 or d < abs(r1 - r2) or d == 0:
-        return []  # No intersections
+    # Keep only the pairs that actually intersect
+    valid = (d <= r1 + r2) & (d >= np.abs(r1 - r2)) & (d > 0)
+    r1, r2, diff, d = r1[valid], r2[valid], diff[valid], d[valid]
+    p0 = drone_positions[i[valid]]
 
     a = (r1**2 - r2**2 + d**2) / (2 * d)
-    h = math.sqrt(r1**2 - a**2)
-    xm = x0 + a * dx / d
-    ym = y0 + a * dy / d
-    rx = -dy * (h / d)
-    ry = dx * (h / d)
+    h = np.sqrt(np.maximum(r1**2 - a**2, 0.0))
+    mid = p0 + (a / d)[:, np.newaxis] * diff
+    offset = (h / d)[:, np.newaxis] * np.column_stack([-diff[:, 1], diff[:, 0]])
 
-    p1 = (xm + rx, ym + ry)
-    p2 = (xm - rx, ym - ry)
-    return [p1, p2]
+    # Interleave so each pair's two points stay adjacent, in pair order
+    return np.stack([mid + offset, mid - offset], axis=1).reshape(-1, 2)
 
 def exact_intersection(drone_positions, distances, tolerance=1e-2):
     """
     Return the point where the most circles intersect (within tolerance).
     """
-    intersections = []
+    drone_positions = np.asarray(drone_positions, dtype=float)
+    distances = np.asarray(distances, dtype=float)
+
+    # Well-conditioned geometry: the linearized solution refined by LM is enough,
+    # so skip the pairwise circle sweep entirely
+    A, _ = build_linear_system(drone_positions, distances)
+    if np.linalg.cond(A) < MAX_CONDITION_NUMBER:
+        return localize_rover_multilateration(drone_positions, distances)
 
     # Generate all pairwise circle intersections
-    for i in range(len(drone_positions)):
-        for j in range(i + 1, len(drone_positions)):
-            points = circle_circle_intersections(
-                drone_positions[i], distances[i],
-                drone_positions[j], distances[j]
-            )
-            intersections.extend(points)
-
-    if not intersections:
+    intersections = circle_circle_intersections(drone_positions, distances)
+
+    if len(intersections) == 0:
         print("No intersections found, falling back to multilateration.")
         return localize_rover_multilateration(drone_positions, distances)
 
-    # Count how many circles each intersection point lies on
-    best_point = None
-    max_count = 0
-
-    for point in intersections:
-        count = sum(
-            abs(calculate_distance(point, drone_positions[k]) - distances[k]) <= tolerance
-            for k in range(len(drone_positions))
-        )
-        if count > max_count:
-            max_count = count
-            best_point = point
-
-    if best_point is not None and max_count >= 3:
-        return best_point
+    # Keep one candidate per tolerance-sized cell; sorting the first-seen indices preserves pair order
+    keys = np.round(intersections / tolerance).astype(np.int64)
+    _, unique_idx = np.unique(keys, axis=0, return_index=True)
+    intersections = intersections[np.sort(unique_idx)]
+
+    # A point on every circle also lies on the first intersecting pair, so it is one of the
+    # first two candidates; return it before scoring the rest
+    head_counts = (np.abs(cdist(intersections[:2], drone_positions) - distances) <= tolerance).sum(axis=1)
+    if head_counts.max() == len(drone_positions):
+        return tuple(intersections[head_counts.argmax()])
+
+    # Count how many circles each intersection point lies on, as one (M, N) distance matrix;
+    # argmax keeps the first point with the highest count
+    counts = (np.abs(cdist(intersections, drone_positions) - distances) <= tolerance).sum(axis=1)
+    best = counts.argmax()
+
+    if counts[best] >= 3:
+        return tuple(intersections[best])
     else:
         print("Could not find a point on 3+ circles. Falling back to multilateration.")
         return localize_rover_multilateration(drone_positions, distances)
 
 def reset_drones():
     global drone_positions
-    drone_positions = []
-    for _ in range(NUM_DRONES):
-        drone_positions.append((random.uniform(-8, 8), random.uniform(-8, 8)))
+    drone_positions = np.random.uniform(-8, 8, (NUM_DRONES, 2))
 
 def update_plot():
     global estimated_rover_pos
-    ax.clear()
-
-    ax.set_xlim(-10, 10)
-    ax.set_ylim(-10, 10)
-    ax.set_xlabel('X Coordinate (m)')
-    ax.set_ylabel('Y Coordinate (m)')
     ax.set_title(f'Rover Localization with {NUM_DRONES} Drones')
 
-    for i, drone_pos in enumerate(drone_positions):
-        ax.scatter(drone_pos[0], drone_pos[1], color='blue', s=100, marker='o', zorder=10)
-        ax.text(drone_pos[0], drone_pos[1] + 0.5, f'D{i+1}', fontsize=9, ha='center',
-                bbox=dict(facecolor='white', alpha=0.7))
-
-    ax.scatter(real_rover_pos[0], real_rover_pos[1], color='red', s=200, marker='*',
-               label='Actual Rover', zorder=10)
-
-    distances = [calculate_distance(drone_pos, real_rover_pos) for drone_pos in drone_positions]
-
-    for i, (drone_pos, distance) in enumerate(zip(drone_positions, distances)):
-        circle = plt.Circle(drone_pos, distance, fill=False, color='blue', linestyle='--', alpha=0.3)
-        ax.add_patch(circle)
-        ax.plot([drone_pos[0], real_rover_pos[0]], [drone_pos[1], real_rover_pos[1]],
-                color='blue', linestyle='--', alpha=0.3)
+    distances = np.linalg.norm(drone_positions - np.asarray(real_rover_pos), axis=1)
+
+    # Move the persistent markers and drone-to-rover lines
+    drone_markers.set_offsets(drone_positions)
+    rover_marker.set_offsets([real_rover_pos])
+    rover = np.broadcast_to(np.asarray(real_rover_pos, dtype=float), drone_positions.shape)
+    range_lines.set_segments(np.stack([drone_positions, rover], axis=1))
+
+    # One label and one range circle per drone, added or removed only when the drone count changes
+    while len(drone_labels) < len(drone_positions):
+        drone_labels.append(ax.text(0, 0, f'D{len(drone_labels) + 1}', fontsize=9, ha='center',
+                                    bbox=dict(facecolor='white', alpha=0.7)))
+        range_circles.append(ax.add_patch(plt.Circle((0, 0), 0, fill=False, color='blue',
+                                                     linestyle='--', alpha=0.3)))
+    while len(drone_labels) > len(drone_positions):
+        drone_labels.pop().remove()
+        range_circles.pop().remove()
+    for label, circle, drone_pos, distance in zip(drone_labels, range_circles, drone_positions, distances):
+        label.set_position((drone_pos[0], drone_pos[1] + 0.5))
+        circle.center = drone_pos
+        circle.set_radius(distance)
 
     if len(drone_positions) >= 3:
         estimated_rover_pos = exact_intersection(drone_positions, distances)
@@ -151,27 +201,23 @@ def update_plot():
     info_text = f'Actual: ({real_rover_pos[0]:.2f}, {real_rover_pos[1]:.2f})\n'
 
     if estimated_rover_pos:
-        ax.scatter(estimated_rover_pos[0], estimated_rover_pos[1], color='purple', s=150, marker='x',
-                   label='Estimated Rover', zorder=5)
-        ax.plot([estimated_rover_pos[0], real_rover_pos[0]],
-                [estimated_rover_pos[1], real_rover_pos[1]],
-                'r-', alpha=0.7, linewidth=1)
+        estimate_marker.set_offsets([estimated_rover_pos])
+        error_line.set_data([estimated_rover_pos[0], real_rover_pos[0]],
+                            [estimated_rover_pos[1], real_rover_pos[1]])
 
-        error = calculate_distance(estimated_rover_pos, real_rover_pos)
-        error_text = f'Error: {error:.2f}m'
-        ax.text(0, 9, error_text, fontsize=12, ha='center',
-                bbox=dict(facecolor='white', alpha=0.7))
+        error = math.dist(estimated_rover_pos, real_rover_pos)
+        error_label.set_text(f'Error: {error:.2f}m')
 
         info_text += f'Estimated: ({estimated_rover_pos[0]:.2f}, {estimated_rover_pos[1]:.2f})\n'
         info_text += f'Error: {error:.2f}m'
     else:
         info_text += 'Estimation failed'
 
-    rover_info.set_text(info_text)
+    for artist in (estimate_marker, error_line, error_label):
+        artist.set_visible(bool(estimated_rover_pos))
 
-    ax.grid(True, linestyle='--', alpha=0.5)
-    ax.legend(loc='lower right')
-    fig.canvas.draw()
+    rover_info.set_text(info_text)
+    fig.canvas.draw_idle()
 
 def randomize_rover(event):
     global real_rover_pos, running
@@ -199,6 +245,23 @@ def update_num_drones(text):
 fig, ax = plt.subplots(figsize=(10, 10))
 plt.subplots_adjust(bottom=0.2)
 
+ax.set_xlim(-10, 10)
+ax.set_ylim(-10, 10)
+ax.set_xlabel('X Coordinate (m)')
+ax.set_ylabel('Y Coordinate (m)')
+ax.grid(True, linestyle='--', alpha=0.5)
+
+# Artists are created once here; update_plot only moves them
+drone_markers = ax.scatter([], [], color='blue', s=100, marker='o', zorder=10)
+rover_marker = ax.scatter([], [], color='red', s=200, marker='*', label='Actual Rover', zorder=10)
+estimate_marker = ax.scatter([], [], color='purple', s=150, marker='x', label='Estimated Rover', zorder=5)
+range_lines = ax.add_collection(LineCollection([], colors='blue', linestyles='--', alpha=0.3))
+error_line, = ax.plot([], [], 'r-', alpha=0.7, linewidth=1)
+error_label = ax.text(0, 9, '', fontsize=12, ha='center', bbox=dict(facecolor='white', alpha=0.7))
+drone_labels = []
+range_circles = []
+ax.legend(loc='lower right')
+
 ax_rand_rover = plt.axes([0.2, 0.05, 0.2, 0.05])
 ax_rand_drones = plt.axes([0.45, 0.05, 0.2, 0.05])
 ax_num_drones = plt.axes([0.7, 0.05, 0.1, 0.05])
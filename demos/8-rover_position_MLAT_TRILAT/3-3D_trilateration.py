@@ -7,7 +7,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox, Slider, CheckButtons
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import random
+import math
+from functools import lru_cache
 
 # plt.style.use('dark_background')
 
@@ -20,51 +23,81 @@ NUM_DRONES = 7
 ROVER_ON_HILL = 10  # degrees
 MIN_DRONE_SEPARATION = 1.5  # Minimum distance between drones
 MIN_DRONE_SAME_DIST_TO_ROVER = 2.0  # Minimum distance difference to rover
+REDRAW_DELAY_MS = 30  # Slider moves within this window are coalesced into one redraw
 
 # Globals
-drone_positions = []
+drone_positions = np.empty((0, 3))
 real_rover_pos = (0, 3, 2)
 estimated_rover_pos = None
 hill_plane = None
 show_paths = True
 show_spheres = True
 show_intersections = True
+hill_z = None
+last_state = None  # Inputs of the last drawn frame
+hill_surface = None
+hill_surface_plane = None  # hill_plane that hill_surface was drawn for
+
+# Hill-plane grid and circle samples, built once and scaled/offset per frame
+_HILL_X, _HILL_Y = np.meshgrid(np.linspace(-10, 10, 20), np.linspace(-10, 10, 20))
+_CIRCLE_COS = np.cos(np.linspace(0, 2 * np.pi, 100))
+_CIRCLE_SIN = np.sin(np.linspace(0, 2 * np.pi, 100))
+
+@lru_cache(maxsize=None)
+def _unit_sphere(resolution):
+    # Unit sphere mesh, built once per resolution and scaled/offset per sphere
+    u = np.linspace(0, 2 * np.pi, resolution)[:, np.newaxis]
+    v = np.linspace(0, np.pi, resolution)[np.newaxis, :]
+    sin_v = np.sin(v)
+    x = np.cos(u) * sin_v
+    y = np.sin(u) * sin_v
+    z = np.broadcast_to(np.cos(v), x.shape)
+    return x, y, z
 
 def calculate_distance(pos1, pos2):
-    return np.linalg.norm(np.array(pos1) - np.array(pos2))
+    return math.dist(pos1, pos2)
 
 def simulate_signal_time_of_flight(drone_position, rover_position):
     distance = calculate_distance(drone_position, rover_position)
     return distance / SPEED_OF_SOUND
 
+def _all_intersection_circles(drones, radii):
+    # Circle of intersection for every drone pair (i < j) in one batch.
+    # Pairs whose spheres do not meet are flagged with valid = False.
+    i, j = np.triu_indices(len(drones), k=1)
+    diff = drones[j] - drones[i]
+    d = np.linalg.norm(diff, axis=1)
+    d_safe = np.where(d > 0, d, 1.0)
+    a = (radii[i]**2 - radii[j]**2 + d**2) / (2 * d_safe)
+    h_squared = radii[i]**2 - a**2
+    valid = (d > 0) & (h_squared >= 0)
+    normals = diff / d_safe[:, np.newaxis]
+    centers = drones[i] + a[:, np.newaxis] * normals
+    h = np.sqrt(np.maximum(h_squared, 0.0))
+    return centers, normals, h, valid
+
+def _build_plane_system(drones, dists):
+    # Each pair of spheres meets on a plane: normal . x = normal . circle_center.
+    # Rows of A are the unit normals of every valid pair.
+    centers, normals, _, valid = _all_intersection_circles(drones, dists)
+    A = normals[valid]
+    b = np.einsum('ij,ij->i', A, centers[valid])
+    return A, b
+
 def localize_rover_plane_intersection(drone_positions, distances):
-    A = []
-    b = []
-    n = len(drone_positions)
-    for i in range(n):
-        for j in range(i+1, n):
-            center1 = drone_positions[i]
-            radius1 = distances[i]
-            center2 = drone_positions[j]
-            radius2 = distances[j]
-            circle_center, normal, h, d = calculate_circle_of_intersection(center1, radius1, center2, radius2)
-            if circle_center is None:
-                continue
-            A_row = [normal[0], normal[1], normal[2]]
-            A.append(A_row)
-            b.append(np.dot(normal, circle_center))
+    drones = np.asarray(drone_positions, dtype=float)
+    A, b = _build_plane_system(drones, np.asarray(distances, dtype=float))
     if len(A) < 1:
-        x_avg = np.mean([p[0] for p in drone_positions])
-        y_avg = np.mean([p[1] for p in drone_positions])
-        z_avg = np.mean([p[2] for p in drone_positions])
-        return (x_avg, y_avg, z_avg)
-    A_np = np.array(A)
-    b_np = np.array(b)
-    result, _, _, _ = np.linalg.lstsq(A_np, b_np, rcond=None)
+        return tuple(drones.mean(axis=0))
+    # lstsq rather than the normal equations: with 3 drones the pair-plane normals
+    # are always coplanar, so A^T A is near-singular without raising, and squaring
+    # the condition number would blow up the unresolved direction. A has only
+    # 3 columns, so the SVD is cheap.
+    result, _, _, _ = np.linalg.lstsq(A, b, rcond=None)
     return tuple(result)
 
 def compute_hill_plane():
-    global hill_plane
+    global hill_plane, hill_z
     rover_x, rover_y, rover_z = real_rover_pos
     angle_rad = np.radians(ROVER_ON_HILL)
     direction = np.arctan2(rover_y, rover_x)
@@ -73,6 +106,7 @@ def compute_hill_plane():
     nz = -np.cos(angle_rad)
     d = nx * rover_x + ny * rover_y + nz * rover_z
     hill_plane = (nx, ny, nz, d)
+    hill_z = (d - nx * _HILL_X - ny * _HILL_Y) / nz
 
 def z_from_plane(x, y):
     nx, ny, nz, d = hill_plane
@@ -83,41 +117,34 @@ def z_from_plane(x, y):
 def generate_drones_above_hill():
     global drone_positions
     compute_hill_plane()
-    drone_positions = []
-    MAX_ATTEMPTS = 100
-
-    for _ in range(NUM_DRONES):
-        attempts = 0
-        placed = False
-        
-        while not placed and attempts < MAX_ATTEMPTS:
-            x = random.uniform(-8, 8)
-            y = random.uniform(-8, 8)
-            z_min = z_from_plane(x, y)
-            z = random.uniform(z_min + 0.5, z_min + 5.0)
-            new_pos = (x, y, z)
-
-            if z > z_min:
-                valid_position = True
-                new_dist = calculate_distance(new_pos, real_rover_pos)
-
-                for existing_pos in drone_positions:
-                    if calculate_distance(new_pos, existing_pos) < MIN_DRONE_SEPARATION:
-                        valid_position = False
-                        break
-                    existing_dist = calculate_distance(existing_pos, real_rover_pos)
-                    if abs(new_dist - existing_dist) < MIN_DRONE_SAME_DIST_TO_ROVER:
-                        valid_position = False
-                        break
-
-                if valid_position or not drone_positions:
-                    drone_positions.append(new_pos)
-                    placed = True
-
-                attempts += 1
-
-        if not placed:
-            print(f"Warning: Could not place drone {_} after {MAX_ATTEMPTS} attempts")
+    rover = np.asarray(real_rover_pos, dtype=float)
+    NUM_CANDIDATES = 500
+
+    # Draw every candidate up front, then accept them greedily in order
+    candidates = np.empty((NUM_CANDIDATES, 3))
+    candidates[:, :2] = np.random.uniform(-8, 8, size=(NUM_CANDIDATES, 2))
+    z_min = z_from_plane(candidates[:, 0], candidates[:, 1])
+    candidates[:, 2] = z_min + np.random.uniform(0.5, 5.0, NUM_CANDIDATES)
+    candidate_dists = np.linalg.norm(candidates - rover, axis=1)
+
+    # Pairwise conflicts between candidates: too close together or too similar a rover distance.
+    # A candidate conflicts with itself, so accepting it also removes it from the pool.
+    gaps = np.linalg.norm(candidates[:, np.newaxis, :] - candidates[np.newaxis, :, :], axis=2)
+    conflicts = (gaps < MIN_DRONE_SEPARATION) | \
+                (np.abs(candidate_dists[:, np.newaxis] - candidate_dists[np.newaxis, :]) < MIN_DRONE_SAME_DIST_TO_ROVER)
+
+    # Greedy pass in draw order: take the first candidate still available, then drop its conflicts
+    available = np.ones(NUM_CANDIDATES, dtype=bool)
+    accepted = []
+    while len(accepted) < NUM_DRONES and available.any():
+        k = np.argmax(available)
+        accepted.append(k)
+        available &= ~conflicts[k]
+
+    if len(accepted) < NUM_DRONES:
+        print(f"Warning: Could only place {len(accepted)} of {NUM_DRONES} drones from {NUM_CANDIDATES} candidates")
+
+    drone_positions = candidates[accepted]
 
 def reset_drones():
     generate_drones_above_hill()
@@ -150,7 +177,9 @@ def update_hill_angle(val):
     global ROVER_ON_HILL
     ROVER_ON_HILL = val
     compute_hill_plane()
-    update_plot()
+    # Restart the one-shot timer so a drag only redraws once it settles
+    redraw_timer.stop()
+    redraw_timer.start()
 
 def toggle_visualization(event):
     global show_paths, show_spheres, show_intersections
@@ -161,107 +190,119 @@ def toggle_visualization(event):
     update_plot()
 
 def plot_sphere(center, radius, color='blue', alpha=0.1, resolution=20):
-    u = np.linspace(0, 2 * np.pi, resolution)
-    v = np.linspace(0, np.pi, resolution)
-    x = center[0] + radius * np.outer(np.cos(u), np.sin(v))
-    y = center[1] + radius * np.outer(np.sin(u), np.sin(v))
-    z = center[2] + radius * np.outer(np.ones(np.size(u)), np.cos(v))
+    unit_x, unit_y, unit_z = _unit_sphere(resolution)
+    x = center[0] + radius * unit_x
+    y = center[1] + radius * unit_y
+    z = center[2] + radius * unit_z
     return ax.plot_surface(x, y, z, color=color, alpha=alpha, shade=True)
 
-def calculate_circle_of_intersection(center1, radius1, center2, radius2):
-    center1 = np.array(center1)
-    center2 = np.array(center2)
-    d = np.linalg.norm(center2 - center1)
-    if d > radius1 + radius2 or d < abs(radius1 - radius2) or d == 0:
-        return None, None, None, 0
-    a = (radius1**2 - radius2**2 + d**2) / (2 * d)
-    h = np.sqrt(radius1**2 - a**2)
-    circle_center = center1 + a * (center2 - center1) / d
-    normal = (center2 - center1) / d
-    return circle_center, normal, h, d
-
-def plot_intersection_circle(center1, radius1, center2, radius2, color='purple', alpha=0.5, resolution=100):
-    circle_center, normal, radius, d = calculate_circle_of_intersection(center1, radius1, center2, radius2)
-    if circle_center is None:
-        return
-    if abs(normal[0]) > abs(normal[1]):
-        basis1 = np.array([-normal[2], 0, normal[0]])
+def plot_intersection_circles(circle_centers, normals, radii, color='purple', alpha=0.5):
+    # One collection is kept across frames; later calls only move its segments
+    global intersection_circles
+    # Orthonormal in-plane basis: (-ny, nx, 0) is perpendicular to every normal
+    # except one along z, which falls back to the x axis
+    basis1 = np.column_stack((-normals[:, 1], normals[:, 0], np.zeros(len(normals))))
+    basis1_norm = np.hypot(normals[:, 0], normals[:, 1])
+    vertical = basis1_norm < 1e-9
+    basis1[vertical] = [1.0, 0.0, 0.0]
+    basis1_norm[vertical] = 1.0
+    basis1 /= basis1_norm[:, np.newaxis]
+    basis2 = np.cross(normals, basis1)
+    # (K, 100, 3) points: every circle sampled at once and drawn as one collection
+    circle_points = circle_centers[:, np.newaxis, :] + radii[:, np.newaxis, np.newaxis] * (
+        basis1[:, np.newaxis, :] * _CIRCLE_COS[np.newaxis, :, np.newaxis] +
+        basis2[:, np.newaxis, :] * _CIRCLE_SIN[np.newaxis, :, np.newaxis])
+    if intersection_circles is None:
+        intersection_circles = Line3DCollection(circle_points, colors=color, alpha=alpha)
+        ax.add_collection3d(intersection_circles)
     else:
-        basis1 = np.array([0, -normal[2], normal[1]])
-    basis1 = basis1 / np.linalg.norm(basis1)
-    basis2 = np.cross(normal, basis1)
-    theta = np.linspace(0, 2 * np.pi, resolution)
-    circle_points = circle_center[:, np.newaxis] + radius * (basis1[:, np.newaxis] * np.cos(theta) + basis2[:, np.newaxis] * np.sin(theta))
-    ax.plot(circle_points[0], circle_points[1], circle_points[2], color=color, alpha=alpha)
+        intersection_circles.set_segments(circle_points)
+    return intersection_circles
 
 def update_plot():
-    global estimated_rover_pos
-    if not drone_positions or not real_rover_pos:
+    global estimated_rover_pos, last_state, spheres_drawn_for, path_lines
+    if len(drone_positions) == 0 or not real_rover_pos:
         print("Plot skipped: positions not initialized.")
         return
-        
-    elev, azim = ax.elev, ax.azim
 
-    distances = [calculate_distance(drone, real_rover_pos) for drone in drone_positions]
-    estimated_rover_pos = localize_rover_plane_intersection(drone_positions, distances)
+    # Skip the redraw if nothing that affects the frame has changed
+    state = (drone_positions.tobytes(), real_rover_pos, hill_plane,
+             show_paths, show_spheres, show_intersections)
+    if state == last_state:
+        return
+    last_state = state
 
-    ax.clear()
-    ax.set_title("3D Drone Localization")
-    ax.set_xlim([-10, 10])
-    ax.set_ylim([-10, 10])
-    ax.set_zlim([0, 12])
-    ax.set_xlabel('X')
-    ax.set_ylabel('Y')
-    ax.set_zlabel('Z')
-    ax.view_init(elev=elev, azim=azim)
+    distances = np.linalg.norm(drone_positions - np.asarray(real_rover_pos), axis=1)
+    estimated_rover_pos = localize_rover_plane_intersection(drone_positions, distances)
 
     plot_hill_plane()
 
-    for i, drone_pos in enumerate(drone_positions):
-        ax.scatter(drone_pos[0], drone_pos[1], drone_pos[2], c='blue', s=50)
-        ax.text(drone_pos[0], drone_pos[1], drone_pos[2], f'D{i}', fontsize=8)
-        if show_paths:
-            ax.plot([drone_pos[0], real_rover_pos[0]], 
-                    [drone_pos[1], real_rover_pos[1]], 
-                    [drone_pos[2], real_rover_pos[2]], 
-                    'k--', alpha=0.3)
-        if show_spheres:
-            radius = calculate_distance(drone_pos, real_rover_pos)
-            plot_sphere(drone_pos, radius, color='blue', alpha=0.1)
+    drone_scatter._offsets3d = (drone_positions[:, 0], drone_positions[:, 1], drone_positions[:, 2])
+    # One reusable D{i} label per drone, moved in place
+    while len(drone_labels) < len(drone_positions):
+        drone_labels.append(ax.text(0, 0, 0, f'D{len(drone_labels)}', fontsize=8))
+    while len(drone_labels) > len(drone_positions):
+        drone_labels.pop().remove()
+    for label, drone_pos in zip(drone_labels, drone_positions):
+        label.set_position_3d(drone_pos)
+
+    # All dashed drone-to-rover paths live in one collection, moved in place
+    path_segments = np.stack([drone_positions,
+                              np.broadcast_to(real_rover_pos, drone_positions.shape)], axis=1)
+    if path_lines is None:
+        path_lines = Line3DCollection(path_segments, colors='k', linestyles='dashed', alpha=0.3)
+        ax.add_collection3d(path_lines)
+    else:
+        path_lines.set_segments(path_segments)
+    path_lines.set_visible(show_paths)
+
+    # Spheres only depend on the drones and the rover, so toggling layers or
+    # moving the hill keeps the existing surfaces and just hides or shows them
+    sphere_key = (drone_positions.tobytes(), real_rover_pos)
+    if show_spheres and sphere_key != spheres_drawn_for:
+        for surface in sphere_surfaces:
+            surface.remove()
+        sphere_surfaces.clear()
+        # Coarser meshes as the drone count grows keep the overlapping surfaces cheap
+        resolution = max(8, 24 - len(drone_positions))
+        sphere_surfaces.extend(plot_sphere(drone_pos, distance, color='blue', alpha=0.1,
+                                           resolution=resolution)
+                               for drone_pos, distance in zip(drone_positions, distances))
+        spheres_drawn_for = sphere_key
+    for surface in sphere_surfaces:
+        surface.set_visible(show_spheres)
     
+    circles_shown = False
     if show_intersections and len(drone_positions) >= 2:
-        for i in range(len(drone_positions)):
-            for j in range(i+1, len(drone_positions)):
-                radius_i = distances[i]
-                radius_j = distances[j]
-                plot_intersection_circle(drone_positions[i], radius_i, 
-                                        drone_positions[j], radius_j, 
-                                        color='purple', alpha=0.7)
+        centers, normals, radii, valid = _all_intersection_circles(drone_positions, distances)
+        if np.any(valid):
+            plot_intersection_circles(centers[valid], normals[valid], radii[valid],
+                                      color='purple', alpha=0.7)
+            circles_shown = True
+    if intersection_circles is not None:
+        intersection_circles.set_visible(circles_shown)
 
     x, y, z = real_rover_pos
-    ax.scatter(x, y, z, c='green', s=80, label='Real Rover')
+    real_rover_marker._offsets3d = ([x], [y], [z])
     if estimated_rover_pos:
         xe, ye, ze = estimated_rover_pos
-        ax.scatter(xe, ye, ze, c='red', s=80, marker='^', label='Estimated Rover')
+        estimated_rover_marker._offsets3d = ([xe], [ye], [ze])
         error = calculate_distance(real_rover_pos, estimated_rover_pos)
-        ax.text(-9, -9, 11, f'Error: {error:.3f} m', fontsize=10)
+        error_text.set_text(f'Error: {error:.3f} m')
+    estimated_rover_marker.set_visible(bool(estimated_rover_pos))
+    error_text.set_visible(bool(estimated_rover_pos))
 
-    ax.legend()
-    props = dict(boxstyle='round', facecolor='wheat', alpha=0.3)
-    ax.text2D(0.02, 0.98, 'Mouse Controls:\n• Left click + drag: Rotate view\n• Right click + drag: Zoom in/out\n• Middle click + drag: Pan view', 
-             transform=ax.transAxes, fontsize=9, verticalalignment='top', bbox=props)
-    
     plt.draw()
 
 def plot_hill_plane():
-    if not hill_plane:
+    # The surface is kept across frames and only rebuilt when the plane itself changes
+    global hill_surface, hill_surface_plane
+    if not hill_plane or hill_plane == hill_surface_plane:
         return
-    nx, ny, nz, d = hill_plane
-    x = np.linspace(-10, 10, 20)
-    y = np.linspace(-10, 10, 20)
-    X, Y = np.meshgrid(x, y)
-    Z = (d - nx * X - ny * Y) / nz
-    ax.plot_surface(X, Y, Z, alpha=0.3, color='brown')
+    if hill_surface is not None:
+        hill_surface.remove()
+    hill_surface = ax.plot_surface(_HILL_X, _HILL_Y, hill_z, alpha=0.3, color='brown')
+    hill_surface_plane = hill_plane
 
 fig = plt.figure(figsize=(12, 10))
 ax = fig.add_subplot(111, projection='3d')
@@ -270,6 +311,35 @@ plt.subplots_adjust(bottom=0.3, left=0.2)
 ax.mouse_init()
 ax.view_init(elev=30, azim=45)
 
+ax.set_title("3D Drone Localization")
+ax.set_xlim([-10, 10])
+ax.set_ylim([-10, 10])
+ax.set_zlim([0, 12])
+ax.set_xlabel('X')
+ax.set_ylabel('Y')
+ax.set_zlabel('Z')
+
+# Persistent artists moved by update_plot
+drone_scatter = ax.scatter([], [], [], c='blue', s=50)
+real_rover_marker = ax.scatter([], [], [], c='green', s=80, label='Real Rover')
+estimated_rover_marker = ax.scatter([], [], [], c='red', s=80, marker='^', label='Estimated Rover')
+error_text = ax.text(-9, -9, 11, '', fontsize=10)
+drone_labels = []
+path_lines = None  # Line3DCollection of drone-to-rover paths, created on the first frame
+intersection_circles = None  # Line3DCollection of sphere-sphere circles, created on first use
+sphere_surfaces = []
+spheres_drawn_for = None  # (drone layout, rover) the current sphere_surfaces were built for
+
+# Legend entries and the help overlay never change, so build them once
+ax.legend()
+props = dict(boxstyle='round', facecolor='wheat', alpha=0.3)
+help_text = ax.text2D(0.02, 0.98, 'Mouse Controls:\n• Left click + drag: Rotate view\n• Right click + drag: Zoom in/out\n• Middle click + drag: Pan view', 
+                      transform=ax.transAxes, fontsize=9, verticalalignment='top', bbox=props)
+
+redraw_timer = fig.canvas.new_timer(interval=REDRAW_DELAY_MS)
+redraw_timer.single_shot = True
+redraw_timer.add_callback(update_plot)
+
 btn_ax1 = plt.axes([0.2, 0.05, 0.2, 0.05])
 btn1 = Button(btn_ax1, 'Randomize Rover')
 btn1.on_clicked(randomize_rover)
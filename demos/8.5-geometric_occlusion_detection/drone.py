@@ -3,6 +3,18 @@ import matplotlib.pyplot as plt
 from typing import Tuple, Optional, List
 import math
 
+# Shared generator for measurement noise and random placement
+_rng = np.random.default_rng()
+
+
+def _obstacle_arrays(obstacles: List) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split obstacle objects into x, y and radius arrays."""
+    obstacle_x = np.array([obstacle.x for obstacle in obstacles], dtype=float)
+    obstacle_y = np.array([obstacle.y for obstacle in obstacles], dtype=float)
+    obstacle_radius = np.array([obstacle.radius for obstacle in obstacles], dtype=float)
+    return obstacle_x, obstacle_y, obstacle_radius
+
+
 class Drone:
     """
     Represents a drone anchor for multilateration positioning.
@@ -49,7 +61,7 @@ class Drone:
         Returns:
             True geometric distance
         """
-        distance = math.sqrt((target_x - self.x)**2 + (target_y - self.y)**2)
+        distance = math.hypot(target_x - self.x, target_y - self.y)
         self.true_distance = distance
         return distance
     
@@ -83,15 +95,15 @@ class Drone:
         # Simulate measurement
         if self.is_occluded:
             # Occluded measurement: add bias and increase noise
-            occlusion_bias = np.random.uniform(0.5, 3.0)  # NLOS bias
+            occlusion_bias = _rng.uniform(0.5, 3.0)  # NLOS bias
             measured_distance = true_distance + occlusion_bias
-            noise = np.random.normal(0, noise_std * 3)  # Higher noise when occluded
-            self.signal_strength = np.random.uniform(10, 40)  # Weak signal
+            noise = _rng.normal(0, noise_std * 3)  # Higher noise when occluded
+            self.signal_strength = _rng.uniform(10, 40)  # Weak signal
         else:
             # Clear LOS measurement
             measured_distance = true_distance
-            noise = np.random.normal(0, noise_std)
-            self.signal_strength = np.random.uniform(80, 100)  # Strong signal
+            noise = _rng.normal(0, noise_std)
+            self.signal_strength = _rng.uniform(80, 100)  # Strong signal
         
         # Add measurement noise
         measured_distance += noise
@@ -102,6 +114,61 @@ class Drone:
         self.measured_distance = measured_distance
         return measured_distance
     
+    @classmethod
+    def simulate_tof_batch(cls, drones: List['Drone'], target_x: float, target_y: float,
+                           obstacles: List = None,
+                           noise_std: float = 0.1) -> np.ndarray:
+        """
+        Simulate Time-of-Flight measurements for several drones at once.
+        
+        Same measurement model as simulate_tof_measurement, with distances,
+        line-of-sight checks and noise drawn for all drones together.
+        
+        Args:
+            drones: List of drones to update
+            target_x: Target X coordinate
+            target_y: Target Y coordinate
+            obstacles: List of obstacle objects (with x, y, radius attributes)
+            noise_std: Standard deviation of measurement noise
+            
+        Returns:
+            Array of measured distances, one per drone
+        """
+        n = len(drones)
+        if n == 0:
+            return np.empty(0)
+        
+        drone_x = np.array([drone.x for drone in drones], dtype=float)
+        drone_y = np.array([drone.y for drone in drones], dtype=float)
+        
+        # Calculate true distances
+        true_distances = np.hypot(target_x - drone_x, target_y - drone_y)
+        
+        # Check for occlusion, drones along rows and obstacles along columns
+        occluded = np.zeros(n, dtype=bool)
+        if obstacles:
+            obstacle_x, obstacle_y, obstacle_radius = _obstacle_arrays(obstacles)
+            occluded = cls._segments_intersect_circles(
+                drone_x[:, np.newaxis], drone_y[:, np.newaxis], target_x, target_y,
+                obstacle_x, obstacle_y, obstacle_radius
+            ).any(axis=1)
+        
+        # Occluded measurements get an NLOS bias, higher noise and a weak signal
+        occlusion_bias = np.where(occluded, _rng.uniform(0.5, 3.0, n), 0.0)
+        noise = _rng.normal(0, np.where(occluded, noise_std * 3, noise_std))
+        signal_strength = _rng.uniform(np.where(occluded, 10, 80), np.where(occluded, 40, 100))
+        
+        # Ensure positive distance
+        measured_distances = np.maximum(0.1, true_distances + occlusion_bias + noise)
+        
+        for i, drone in enumerate(drones):
+            drone.true_distance = float(true_distances[i])
+            drone.is_occluded = bool(occluded[i])
+            drone.signal_strength = float(signal_strength[i])
+            drone.measured_distance = float(measured_distances[i])
+        
+        return measured_distances
+    
     def _check_line_of_sight_blocked(self, target_x: float, target_y: float, 
                                    obstacles: List) -> bool:
         """
@@ -115,54 +182,47 @@ class Drone:
         Returns:
             True if line of sight is blocked
         """
-        for obstacle in obstacles:
-            if self._line_intersects_circle(
-                self.x, self.y, target_x, target_y,
-                obstacle.x, obstacle.y, obstacle.radius
-            ):
-                return True
-        return False
+        if not obstacles:
+            return False
+        
+        obstacle_x, obstacle_y, obstacle_radius = _obstacle_arrays(obstacles)
+        return bool(np.any(self._segments_intersect_circles(
+            self.x, self.y, target_x, target_y,
+            obstacle_x, obstacle_y, obstacle_radius
+        )))
     
-    def _line_intersects_circle(self, x1: float, y1: float, x2: float, y2: float,
-                               cx: float, cy: float, radius: float) -> bool:
+    @staticmethod
+    def _segments_intersect_circles(x1, y1, x2, y2, cx, cy, radius) -> np.ndarray:
         """
-        Check if line segment intersects with circle.
+        Check if line segments intersect with circles, broadcasting over arrays.
         
         Args:
-            x1, y1: Start point of line
-            x2, y2: End point of line
-            cx, cy: Circle center
-            radius: Circle radius
+            x1, y1: Start point(s) of line
+            x2, y2: End point(s) of line
+            cx, cy: Circle center(s)
+            radius: Circle radius (radii)
             
         Returns:
-            True if line intersects circle
+            Boolean array, True where the line intersects the circle
         """
         # Vector from start to end
         dx = x2 - x1
         dy = y2 - y1
         
         # Vector from start to circle center
-        fx = x1 - cx
-        fy = y1 - cy
-        
-        # Quadratic equation coefficients
-        a = dx*dx + dy*dy
-        b = 2*(fx*dx + fy*dy)
-        c = (fx*fx + fy*fy) - radius*radius
+        fx = cx - x1
+        fy = cy - y1
         
-        discriminant = b*b - 4*a*c
-        
-        if discriminant < 0:
-            return False
+        # Parameter of the point on the segment closest to the circle center;
+        # a zero-length segment yields NaN and is treated as not intersecting
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip((fx*dx + fy*dy) / (dx*dx + dy*dy), 0.0, 1.0)
         
-        # Check if intersection points are within line segment
-        discriminant = math.sqrt(discriminant)
-        
-        t1 = (-b - discriminant) / (2*a)
-        t2 = (-b + discriminant) / (2*a)
-        
-        # Check if either intersection point is within the line segment
-        return (0 <= t1 <= 1) or (0 <= t2 <= 1) or (t1 < 0 and t2 > 1)
+        # The segment touches the circle when that closest point lies within
+        # the radius, compared on squared distances so no sqrt is needed
+        offset_x = dx*t - fx
+        offset_y = dy*t - fy
+        return offset_x*offset_x + offset_y*offset_y <= radius*radius
     
     def randomize_position(self, x_min: float = -50, x_max: float = 50,
                           y_min: float = -50, y_max: float = 50):
@@ -173,10 +233,25 @@ class Drone:
             x_min, x_max: X coordinate bounds
             y_min, y_max: Y coordinate bounds
         """
-        new_x = np.random.uniform(x_min, x_max)
-        new_y = np.random.uniform(y_min, y_max)
+        new_x = _rng.uniform(x_min, x_max)
+        new_y = _rng.uniform(y_min, y_max)
         self.set_position(new_x, new_y)
     
+    @classmethod
+    def randomize_positions(cls, drones: List['Drone'], x_min: float = -50, x_max: float = 50,
+                            y_min: float = -50, y_max: float = 50):
+        """
+        Randomize the positions of several drones with a single draw.
+        
+        Args:
+            drones: List of drones to move
+            x_min, x_max: X coordinate bounds
+            y_min, y_max: Y coordinate bounds
+        """
+        positions = _rng.uniform((x_min, y_min), (x_max, y_max), size=(len(drones), 2))
+        for drone, (x, y) in zip(drones, positions.tolist()):
+            drone.set_position(x, y)
+    
     def plot_drone(self, ax, color='blue', size=100):
         """
         Plot the drone on the given axis.
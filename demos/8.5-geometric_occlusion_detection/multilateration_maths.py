@@ -2,6 +2,7 @@ import numpy as np
 import math
 from typing import List, Tuple, Optional
 from scipy.optimize import least_squares
+from scipy.spatial.distance import cdist
 
 class MultilaterationSolver:
     """
@@ -10,7 +11,12 @@ class MultilaterationSolver:
     
     def __init__(self):
         """Initialize the multilateration solver."""
-        pass
+        # Last solved position, used as the next least-squares starting point
+        self._last_solution = None
+    
+    def reset(self):
+        """Forget the last solution, e.g. when the drones or the target jump."""
+        self._last_solution = None
     
     def solve(self, drones: List, method: str = 'hybrid') -> Optional[Tuple[float, float]]:
         """
@@ -26,25 +32,29 @@ class MultilaterationSolver:
         if len(drones) < 3:
             return None
         
-        # Extract positions and distances
-        positions = [(drone.x, drone.y) for drone in drones]
-        distances = [drone.measured_distance for drone in drones if drone.measured_distance is not None]
+        # Extract positions and distances once, as the float64 arrays every solver works on
+        positions = np.array([(drone.x, drone.y) for drone in drones], dtype=np.float64)
+        distances = np.array([drone.measured_distance for drone in drones if drone.measured_distance is not None],
+                             dtype=np.float64)
         
         if len(distances) < 3:
             return None
         
         if method == 'least_squares':
-            return self._solve_least_squares(positions, distances)
+            result = self._solve_least_squares(positions, distances)
         elif method == 'geometric':
-            return self._solve_geometric(positions, distances)
+            result = self._solve_geometric(positions, distances)
         elif method == 'hybrid':
             # Try geometric first, fall back to least squares
             result = self._solve_geometric(positions, distances)
             if result is None:
                 result = self._solve_least_squares(positions, distances)
-            return result
         else:
             raise ValueError(f"Unknown method: {method}")
+        
+        if result is not None:
+            self._last_solution = result
+        return result
     
     def _solve_least_squares(self, positions: List[Tuple[float, float]], 
                            distances: List[float]) -> Optional[Tuple[float, float]]:
@@ -58,23 +68,29 @@ class MultilaterationSolver:
         Returns:
             Estimated position (x, y) or None if failed
         """
-        # Initial guess - centroid of drone positions
-        x_avg = sum(pos[0] for pos in positions) / len(positions)
-        y_avg = sum(pos[1] for pos in positions) / len(positions)
-        initial_guess = [x_avg, y_avg]
+        all_positions = np.asarray(positions, dtype=np.float64)
+        
+        # Initial guess - last solution while tracking, else centroid of drone positions
+        if self._last_solution is not None:
+            initial_guess = np.asarray(self._last_solution, dtype=np.float64)
+        else:
+            initial_guess = all_positions.mean(axis=0)
+        
+        # Only drones with a matching distance take part in the fit
+        dist_arr = np.asarray(distances, dtype=np.float64)
+        positions_arr = all_positions[:len(dist_arr)]
         
         def objective_function(point):
-            x, y = point
-            errors = []
-            for i, (px, py) in enumerate(positions):
-                if i < len(distances):
-                    calculated_distance = np.sqrt((x - px)**2 + (y - py)**2)
-                    error = calculated_distance - distances[i]
-                    errors.append(error)
-            return errors
+            return np.linalg.norm(positions_arr - point, axis=1) - dist_arr
+        
+        def jacobian(point):
+            # Unit vectors from each drone towards the point
+            diff = point - positions_arr
+            norms = np.linalg.norm(diff, axis=1, keepdims=True)
+            return diff / np.where(norms > 0, norms, 1.0)
         
         try:
-            result = least_squares(objective_function, initial_guess, method='lm')
+            result = least_squares(objective_function, initial_guess, jac=jacobian, method='lm')
             if result.success:
                 return tuple(result.x)
             else:
@@ -95,96 +111,75 @@ class MultilaterationSolver:
         Returns:
             Estimated position (x, y) or None if failed
         """
-        # Generate all pairwise circle intersections
-        intersections = []
-        
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
-                if i < len(distances) and j < len(distances):
-                    points = self._circle_intersection(
-                        positions[i], distances[i],
-                        positions[j], distances[j]
-                    )
-                    intersections.extend(points)
-        
-        if not intersections:
+        anchors = np.asarray(positions[:len(distances)], dtype=np.float64)
+        radii = np.asarray(distances, dtype=np.float64)
+        
+        # Generate all pairwise circle intersections in one batch
+        intersections = self._circle_intersections(anchors, radii)
+        
+        if len(intersections) == 0:
             return None
         
-        # Find the point where the most circles intersect
-        best_point = None
-        max_count = 0
-        
-        for point in intersections:
-            count = 0
-            for k in range(len(positions)):
-                if k < len(distances):
-                    calculated_distance = np.sqrt((point[0] - positions[k][0])**2 + 
-                                               (point[1] - positions[k][1])**2)
-                    if abs(calculated_distance - distances[k]) <= tolerance:
-                        count += 1
-            
-            if count > max_count:
-                max_count = count
-                best_point = point
+        # Find the point where the most circles intersect, counting every
+        # candidate against every circle from one (M, N) distance matrix
+        calculated_distances = cdist(intersections, anchors)
+        counts = (np.abs(calculated_distances - radii) <= tolerance).sum(axis=1)
+        best = int(np.argmax(counts))
         
         # Require at least 3 circles to intersect at the point
-        if best_point is not None and max_count >= 3:
-            return best_point
+        if counts[best] >= 3:
+            return tuple(intersections[best].tolist())
         else:
             return None
     
-    def _circle_intersection(self, center1: Tuple[float, float], radius1: float,
-                           center2: Tuple[float, float], radius2: float) -> List[Tuple[float, float]]:
+    def _circle_intersections(self, positions: List[Tuple[float, float]],
+                              distances: List[float]) -> np.ndarray:
         """
-        Find intersection points between two circles.
+        Find intersection points between every pair of circles at once.
         
         Args:
-            center1: Center of first circle (x, y)
-            radius1: Radius of first circle
-            center2: Center of second circle (x, y)
-            radius2: Radius of second circle
+            positions: List of circle centers [(x, y), ...]
+            distances: List of circle radii
             
         Returns:
-            List of intersection points (empty if no intersection)
+            (M, 2) array of intersection points in pair order: two per
+            intersecting pair, one (the midpoint) per tangent pair, none for
+            concentric or non-intersecting pairs
         """
-        x1, y1 = center1
-        x2, y2 = center2
+        centers = np.asarray(positions, dtype=np.float64)
+        radii = np.asarray(distances, dtype=np.float64)
+        i, j = np.triu_indices(len(centers), k=1)
         
-        # Distance between centers
-        d = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        diff = centers[j] - centers[i]
+        d_squared = np.einsum('ij,ij->i', diff, diff)
+        r1, r2 = radii[i], radii[j]
         
-        # Check if circles intersect
-        if d > radius1 + radius2 or d < abs(radius1 - radius2) or d == 0:
-            return []
+        # Keep only pairs whose circles intersect, compared on squared
+        # distances so the square root is taken for those pairs alone
+        valid = (d_squared <= (r1 + r2)**2) & (d_squared >= (r1 - r2)**2) & (d_squared != 0)
+        i, diff, d_squared, r1, r2 = i[valid], diff[valid], d_squared[valid], r1[valid], r2[valid]
         
-        # Calculate intersection points
-        try:
-            a = (radius1**2 - radius2**2 + d**2) / (2 * d)
-            h_squared = radius1**2 - a**2
-            
-            if h_squared < 0:
-                return []
-            
-            h = math.sqrt(h_squared)
-            
-            # Midpoint between intersections
-            x_mid = x1 + a * (x2 - x1) / d
-            y_mid = y1 + a * (y2 - y1) / d
-            
-            if h < 1e-10:  # Circles are tangent
-                return [(x_mid, y_mid)]
-            
-            # The two intersection points
-            x_int1 = x_mid + h * (y2 - y1) / d
-            y_int1 = y_mid - h * (x2 - x1) / d
-            
-            x_int2 = x_mid - h * (y2 - y1) / d
-            y_int2 = y_mid + h * (x2 - x1) / d
-            
-            return [(x_int1, y_int1), (x_int2, y_int2)]
-            
-        except (ZeroDivisionError, ValueError):
-            return []
+        d = np.sqrt(d_squared)
+        a = (r1**2 - r2**2 + d_squared) / (2 * d)
+        h_squared = r1**2 - a**2
+        
+        valid = h_squared >= 0
+        i, diff, d, a, h_squared = i[valid], diff[valid], d[valid], a[valid], h_squared[valid]
+        
+        h = np.sqrt(h_squared)
+        unit = diff / d[:, np.newaxis]
+        
+        # Midpoint between intersections and perpendicular offset
+        midpoints = centers[i] + a[:, np.newaxis] * unit
+        offsets = h[:, np.newaxis] * np.column_stack((unit[:, 1], -unit[:, 0]))
+        points = np.stack((midpoints + offsets, midpoints - offsets), axis=1)
+        
+        # Tangent circles contribute only their midpoint
+        tangent = h < 1e-10
+        points[tangent, 0] = midpoints[tangent]
+        keep = np.column_stack((np.ones(len(h), dtype=bool), ~tangent))
+        
+        return points[keep]
     
     def calculate_position_error(self, estimated_pos: Tuple[float, float], 
                                positions: List[Tuple[float, float]],
@@ -203,19 +198,12 @@ class MultilaterationSolver:
         if not estimated_pos:
             return float('inf')
         
-        x_est, y_est = estimated_pos
-        errors = []
-        
-        for i, (px, py) in enumerate(positions):
-            if i < len(distances):
-                calculated_distance = np.sqrt((x_est - px)**2 + (y_est - py)**2)
-                error = abs(calculated_distance - distances[i])
-                errors.append(error)
+        residuals = self._residual_array(estimated_pos, positions, distances)
         
-        if not errors:
+        if residuals.size == 0:
             return float('inf')
         
-        return np.sqrt(np.mean(np.array(errors)**2))
+        return math.sqrt(np.mean(residuals**2))
     
     def get_residuals(self, estimated_pos: Tuple[float, float], 
                      positions: List[Tuple[float, float]],
@@ -234,13 +222,15 @@ class MultilaterationSolver:
         if not estimated_pos:
             return []
         
-        x_est, y_est = estimated_pos
-        residuals = []
-        
-        for i, (px, py) in enumerate(positions):
-            if i < len(distances):
-                calculated_distance = np.sqrt((x_est - px)**2 + (y_est - py)**2)
-                residual = calculated_distance - distances[i]
-                residuals.append(residual)
-        
-        return residuals
\ No newline at end of file
+        return self._residual_array(estimated_pos, positions, distances).tolist()
+    
+    def _residual_array(self, estimated_pos: Tuple[float, float], 
+                        positions: List[Tuple[float, float]],
+                        distances: List[float]) -> np.ndarray:
+        """Calculated minus measured distance for each drone that has a measurement."""
+        dist_arr = np.asarray(distances, dtype=np.float64)
+        positions_arr = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        n = min(len(positions_arr), len(dist_arr))
+        
+        calculated_distances = np.linalg.norm(positions_arr[:n] - np.asarray(estimated_pos, dtype=np.float64), axis=1)
+        return calculated_distances - dist_arr[:n]
\ No newline at end of file
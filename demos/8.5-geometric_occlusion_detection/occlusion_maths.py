@@ -1,7 +1,7 @@
 import numpy as np
-import math
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass
+from scipy.spatial.distance import cdist, pdist
 
 @dataclass
 class OcclusionResult:
@@ -29,6 +29,10 @@ class OcclusionDetector:
         self.geometric_tolerance = geometric_tolerance
         self.min_intersection_confidence = 0.6
         
+        # Inter-drone distances for the last drone layout seen
+        self._pair_distance_key = None
+        self._pair_distance_cache = None
+        
     def detect_occlusion(self, drones: List, rover_true_pos: Tuple[float, float] = None) -> OcclusionResult:
         """
         Detect occlusion using geometric circle intersection analysis.
@@ -81,18 +85,12 @@ class OcclusionDetector:
         """
         n_drones = len(drones)
         
-        # Step 1: Generate all pairwise circle intersections
-        intersection_points = []
-        
-        for i in range(n_drones):
-            for j in range(i + 1, n_drones):
-                points = self._calculate_circle_intersection(
-                    (drones[i].x, drones[i].y), drones[i].measured_distance,
-                    (drones[j].x, drones[j].y), drones[j].measured_distance
-                )
-                intersection_points.extend(points)
+        # Step 1: Generate all pairwise circle intersections in one batch
+        positions = np.array([(drone.x, drone.y) for drone in drones], dtype=np.float64)
+        ranges = np.array([drone.measured_distance for drone in drones], dtype=np.float64)
+        intersection_points = self._calculate_circle_intersections(positions, ranges)
         
-        if not intersection_points:
+        if len(intersection_points) == 0:
             # No intersections found - all drones likely occluded
             return OcclusionResult(
                 occluded_drones=[d.drone_id for d in drones],
@@ -104,37 +102,35 @@ class OcclusionDetector:
                 detection_confidence=0.0
             )
         
-        # Step 2: Find point with maximum circle intersections
-        best_point = None
-        max_intersections = 0
-        intersection_counts = []
+        # Step 2: Find point with maximum circle intersections, counting every
+        # candidate against every drone circle from one distance matrix
+        candidate_errors = np.abs(cdist(intersection_points, positions) - ranges)
+        intersection_counts = (candidate_errors <= self.geometric_tolerance).sum(axis=1)
         
-        for point in intersection_points:
-            count = self._count_intersecting_circles(point, drones)
-            intersection_counts.append(count)
-            
-            if count > max_intersections:
-                max_intersections = count
-                best_point = point
+        best = int(np.argmax(intersection_counts))
+        max_intersections = int(intersection_counts[best])
+        best_point = tuple(intersection_points[best].tolist()) if max_intersections > 0 else None
         
         # Step 3: Analyze occlusion based on intersection count
         rover_estimate = best_point
         geometric_errors = []
         occluded_drone_ids = []
+        avg_error = None
         
         if rover_estimate is not None:
-            # Calculate errors for each drone
-            for drone in drones:
-                error = self._calculate_geometric_error(rover_estimate, drone)
-                geometric_errors.append(error)
-                
-                # Mark drone as occluded if error exceeds tolerance
-                if error > self.geometric_tolerance:
-                    occluded_drone_ids.append(drone.drone_id)
+            # Calculate errors for all drones at once
+            calculated_distances = np.linalg.norm(positions - np.asarray(rover_estimate), axis=1)
+            errors = np.abs(calculated_distances - ranges)
+            geometric_errors = errors.tolist()
+            avg_error = float(errors.mean())
+            
+            # Mark drones as occluded where the error exceeds tolerance
+            occluded_drone_ids = [drones[k].drone_id
+                                  for k in np.flatnonzero(errors > self.geometric_tolerance)]
         
         # Step 4: Determine detection confidence
         detection_confidence = self._calculate_detection_confidence(
-            max_intersections, n_drones, geometric_errors
+            max_intersections, n_drones, avg_error
         )
         
         return OcclusionResult(
@@ -147,128 +143,89 @@ class OcclusionDetector:
             detection_confidence=detection_confidence
         )
     
-    def _calculate_circle_intersection(self, center1: Tuple[float, float], radius1: float,
-                                     center2: Tuple[float, float], radius2: float) -> List[Tuple[float, float]]:
+    def _calculate_circle_intersections(self, centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
         """
-        Calculate intersection points between two circles.
+        Calculate intersection points between every pair of circles at once.
         
         Args:
-            center1: Center of first circle (x, y)
-            radius1: Radius of first circle
-            center2: Center of second circle (x, y)
-            radius2: Radius of second circle
+            centers: (N, 2) array of circle centers
+            radii: (N,) array of circle radii
             
         Returns:
-            List of intersection points
+            (M, 2) array of intersection points in pair order: two per
+            intersecting pair, one (the midpoint) per tangent pair, none for
+            concentric pairs or pairs too far apart even within tolerance
         """
-        x1, y1 = center1
-        x2, y2 = center2
+        i, j = np.triu_indices(len(centers), k=1)
         
-        # Calculate distance between centers
-        d = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        diff = centers[j] - centers[i]
+        d = self._pair_distances(centers)
+        r1, r2 = radii[i], radii[j]
         
-        # Check for intersection feasibility
-        if d > radius1 + radius2 + self.geometric_tolerance:
-            return []  # Circles too far apart
+        # Keep pairs whose circles meet, widened by the geometric tolerance
+        valid = ((d <= r1 + r2 + self.geometric_tolerance) &
+                 (d >= np.abs(r1 - r2) - self.geometric_tolerance) &
+                 (d != 0))
+        i, diff, d, r1, r2 = i[valid], diff[valid], d[valid], r1[valid], r2[valid]
         
-        if d < abs(radius1 - radius2) - self.geometric_tolerance:
-            return []  # One circle inside the other
+        a = (r1**2 - r2**2 + d**2) / (2 * d)
+        h_squared = r1**2 - a**2
         
-        if d == 0 and radius1 == radius2:
-            return []  # Identical circles (infinite intersections)
+        valid = h_squared >= 0
+        i, diff, d, a, h_squared = i[valid], diff[valid], d[valid], a[valid], h_squared[valid]
         
-        if d == 0:
-            return []  # Concentric circles
-        
-        # Calculate intersection points
-        try:
-            a = (radius1**2 - radius2**2 + d**2) / (2 * d)
-            h_squared = radius1**2 - a**2
-            
-            if h_squared < 0:
-                return []
-            
-            h = math.sqrt(h_squared)
-            
-            # Midpoint calculation
-            x_m = x1 + a * (x2 - x1) / d
-            y_m = y1 + a * (y2 - y1) / d
-            
-            if h < 1e-10:  # Tangent circles
-                return [(x_m, y_m)]
-            
-            # Two intersection points
-            x_int1 = x_m + h * (y2 - y1) / d
-            y_int1 = y_m - h * (x2 - x1) / d
-            
-            x_int2 = x_m - h * (y2 - y1) / d
-            y_int2 = y_m + h * (x2 - x1) / d
-            
-            return [(x_int1, y_int1), (x_int2, y_int2)]
-            
-        except (ZeroDivisionError, ValueError, OverflowError):
-            return []
-    
-    def _count_intersecting_circles(self, point: Tuple[float, float], drones: List) -> int:
-        """
-        Count how many drone circles intersect at a given point.
+        h = np.sqrt(h_squared)
+        unit = diff / d[:, np.newaxis]
         
-        Args:
-            point: Point to check (x, y)
-            drones: List of drone objects
-            
-        Returns:
-            Number of circles intersecting at the point
-        """
-        x, y = point
-        count = 0
+        # Midpoint and perpendicular offset for each pair
+        midpoints = centers[i] + a[:, np.newaxis] * unit
+        offsets = h[:, np.newaxis] * np.column_stack((unit[:, 1], -unit[:, 0]))
+        points = np.stack((midpoints + offsets, midpoints - offsets), axis=1)
         
-        for drone in drones:
-            distance_to_point = math.sqrt((x - drone.x)**2 + (y - drone.y)**2)
-            error = abs(distance_to_point - drone.measured_distance)
-            
-            if error <= self.geometric_tolerance:
-                count += 1
+        # Tangent circles contribute only their midpoint
+        tangent = h < 1e-10
+        points[tangent, 0] = midpoints[tangent]
+        keep = np.column_stack((np.ones(len(h), dtype=bool), ~tangent))
         
-        return count
+        return points[keep]
     
-    def _calculate_geometric_error(self, rover_position: Tuple[float, float], drone) -> float:
+    def _pair_distances(self, positions: np.ndarray) -> np.ndarray:
         """
-        Calculate geometric error between rover position and drone measurement.
+        Get distances between every pair of drones, in triu_indices order.
         
         Args:
-            rover_position: Estimated rover position (x, y)
-            drone: Drone object with measured distance
+            positions: (N, 2) array of drone positions
             
         Returns:
-            Geometric error in meters
+            Condensed pairwise distance array, reused while the drones stay put
         """
-        x_rover, y_rover = rover_position
-        calculated_distance = math.sqrt((x_rover - drone.x)**2 + (y_rover - drone.y)**2)
-        
-        return abs(calculated_distance - drone.measured_distance)
+        key = positions.tobytes()
+        if key != self._pair_distance_key:
+            self._pair_distance_key = key
+            self._pair_distance_cache = pdist(positions)
+        return self._pair_distance_cache
     
     def _calculate_detection_confidence(self, max_intersections: int, total_drones: int,
-                                      geometric_errors: List[float]) -> float:
+                                      avg_error: Optional[float]) -> float:
         """
         Calculate confidence level for occlusion detection.
         
         Args:
             max_intersections: Maximum number of intersecting circles
             total_drones: Total number of drones
-            geometric_errors: List of geometric errors
+            avg_error: Mean geometric error, already reduced from the error
+                array by the caller (None when there are no errors)
             
         Returns:
             Confidence level (0.0 to 1.0)
         """
-        if not geometric_errors:
+        if avg_error is None:
             return 0.0
         
         # Base confidence from intersection ratio
         intersection_ratio = max_intersections / total_drones
         
         # Penalize high geometric errors
-        avg_error = np.mean(geometric_errors)
         error_penalty = min(avg_error / self.geometric_tolerance, 1.0)
         
         # Combined confidence
@@ -286,29 +243,29 @@ class OcclusionDetector:
         Returns:
             Dictionary mapping drone_id to violation status
         """
-        violations = {}
+        violations = {drone.drone_id: False for drone in drones}
         
-        for i, drone_i in enumerate(drones):
-            violations[drone_i.drone_id] = False
-            
-            for j, drone_j in enumerate(drones):
-                if i >= j:
-                    continue
-                
-                # Distance between drones
-                d_ij = math.sqrt((drone_j.x - drone_i.x)**2 + (drone_j.y - drone_i.y)**2)
-                
-                # Measured distances to rover
-                r_i = drone_i.measured_distance
-                r_j = drone_j.measured_distance
-                
-                if r_i is None or r_j is None:
-                    continue
-                
-                # Check triangle inequality: |r_i - r_j| <= d_ij <= r_i + r_j
-                if not (abs(r_i - r_j) <= d_ij <= r_i + r_j + self.geometric_tolerance):
-                    violations[drone_i.drone_id] = True
-                    violations[drone_j.drone_id] = True
+        measured = [drone for drone in drones if drone.measured_distance is not None]
+        if len(measured) < 2:
+            return violations
+        
+        positions = np.array([(drone.x, drone.y) for drone in measured], dtype=np.float64)
+        ranges = np.array([drone.measured_distance for drone in measured], dtype=np.float64)
+        
+        # Distance between drones for every pair, in triu_indices order
+        i, j = np.triu_indices(len(measured), k=1)
+        d_ij = self._pair_distances(positions)
+        
+        # Check triangle inequality: |r_i - r_j| <= d_ij <= r_i + r_j
+        satisfied = ((np.abs(ranges[i] - ranges[j]) <= d_ij) &
+                     (d_ij <= ranges[i] + ranges[j] + self.geometric_tolerance))
+        
+        # Flag both drones of every failing pair in one boolean mask
+        violated = np.zeros(len(measured), dtype=bool)
+        violated[i[~satisfied]] = True
+        violated[j[~satisfied]] = True
+        
+        violations.update(zip((drone.drone_id for drone in measured), violated.tolist()))
         
         return violations
     
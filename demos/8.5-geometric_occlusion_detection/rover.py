@@ -1,5 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import math
+from collections import deque
 from typing import Tuple, Optional
 
 class Rover:
@@ -19,8 +21,9 @@ class Rover:
         self.y = y
         self.estimated_x = None
         self.estimated_y = None
-        self.position_history = []
-        self.estimation_history = []
+        # Last 100 positions and estimations; full deques drop their oldest entry
+        self.position_history = deque(maxlen=100)
+        self.estimation_history = deque(maxlen=100)
         
     def get_position(self) -> Tuple[float, float]:
         """Get the current true position of the rover."""
@@ -33,10 +36,6 @@ class Rover:
         
         # Store position history
         self.position_history.append((self.x, self.y))
-        
-        # Keep only last 100 positions
-        if len(self.position_history) > 100:
-            self.position_history.pop(0)
     
     def move_to(self, x: float, y: float):
         """Move the rover to a new position."""
@@ -55,10 +54,6 @@ class Rover:
         
         # Store estimation history
         self.estimation_history.append((self.estimated_x, self.estimated_y))
-        
-        # Keep only last 100 estimations
-        if len(self.estimation_history) > 100:
-            self.estimation_history.pop(0)
     
     def get_estimated_position(self) -> Tuple[Optional[float], Optional[float]]:
         """Get the current estimated position."""
@@ -77,7 +72,7 @@ class Rover:
         dx = self.x - self.estimated_x
         dy = self.y - self.estimated_y
         
-        return np.sqrt(dx**2 + dy**2)
+        return math.hypot(dx, dy)
     
     def randomize_position(self, x_min: float = -50, x_max: float = 50, 
                          y_min: float = -50, y_max: float = 50):
@@ -162,10 +157,9 @@ class Rover:
             alpha: Transparency of the history markers
         """
         if len(self.position_history) > 1:
-            x_hist = [pos[0] for pos in self.position_history[:-1]]  # Exclude current position
-            y_hist = [pos[1] for pos in self.position_history[:-1]]
+            history = np.array(self.position_history)[:-1]  # Exclude current position
             
-            ax.scatter(x_hist, y_hist, c=color, s=20, alpha=alpha, marker='o')
+            ax.scatter(history[:, 0], history[:, 1], c=color, s=20, alpha=alpha, marker='o')
     
     def plot_estimation_history(self, ax, color='lightyellow', alpha=0.5):
         """
@@ -177,8 +171,9 @@ class Rover:
             alpha: Transparency of the history markers
         """
         if len(self.estimation_history) > 1:
-            x_hist = [pos[0] for pos in self.estimation_history[:-1] if pos[0] is not None]
-            y_hist = [pos[1] for pos in self.estimation_history[:-1] if pos[1] is not None]
+            history = list(self.estimation_history)[:-1]  # Exclude current estimation
+            x_hist = [pos[0] for pos in history if pos[0] is not None]
+            y_hist = [pos[1] for pos in history if pos[1] is not None]
             
             if x_hist and y_hist:
                 ax.scatter(x_hist, y_hist, c=color, s=20, alpha=alpha, marker='D')
@@ -2,6 +2,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, Slider
 import matplotlib.patches as patches
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.colors import to_rgba
 from typing import List, Tuple, Optional
 import random
 
@@ -38,6 +41,14 @@ class Obstacle:
 class OcclusionSimulation:
     """Interactive simulation for target occlusion detection."""
     
+    # Styles indexed by state (clear/occluded, unselected/selected), converted
+    # to RGBA once here instead of on every display update
+    DRONE_EDGE_COLORS = (to_rgba('black'), to_rgba('red'))
+    TARGET_LINE_COLORS = (to_rgba('gray', 0.6), to_rgba('red', 0.8))
+    RANGE_CIRCLE_STYLES = ((to_rgba('lightblue', 0.3), to_rgba('lightblue'), '-'),
+                           (to_rgba('pink', 0.2), to_rgba('pink'), '--'))
+    OBSTACLE_COLORS = (to_rgba('red', 0.6), to_rgba('darkred', 0.8))
+    
     def __init__(self):
         """Initialize the simulation."""
         self.fig, self.ax = plt.subplots(figsize=(14, 10))
@@ -55,9 +66,14 @@ class OcclusionSimulation:
         self.dragging = False
         self.last_occlusion_result = None
         
+        # Static background captured after each full redraw, for blitting
+        self._background = None
+        
         # Create initial setup
         self._create_initial_setup()
         self._create_ui_elements()
+        self._setup_axes()
+        self._create_plot_artists()
         self._connect_events()
         
         # Update display
@@ -121,11 +137,122 @@ class OcclusionSimulation:
         self.btn_update = Button(ax_update, 'Update Sim')
         self.btn_update.on_clicked(self._force_update)
     
+    def _setup_axes(self):
+        """Set up the parts of the plot that never change: limits, labels and legend."""
+        self.ax.set_xlim(-60, 60)
+        self.ax.set_ylim(-60, 60)
+        self.ax.set_aspect('equal')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.set_title('Target Occlusion Detection Simulation', fontsize=14, fontweight='bold')
+        self.ax.set_xlabel('X Position (meters)')
+        self.ax.set_ylabel('Y Position (meters)')
+        
+        # Legend from fixed proxies, so it stays in the cached background
+        legend_handles = [
+            patches.Patch(facecolor='red', alpha=0.6, label='Obstacles'),
+            Line2D([], [], linestyle='none', marker='^', markersize=10, markerfacecolor='blue',
+                   markeredgecolor='black', label='Drones'),
+            Line2D([], [], linestyle='none', marker='s', markersize=12, markerfacecolor='green',
+                   markeredgecolor='black', markeredgewidth=2, label='True Rover'),
+            Line2D([], [], linestyle='none', marker='D', markersize=11, markerfacecolor='orange',
+                   markeredgecolor='black', markeredgewidth=2, alpha=0.8, label='Estimated Rover'),
+            Line2D([], [], color='purple', linewidth=2, alpha=0.7, linestyle='--', label='Position Error'),
+        ]
+        self.ax.legend(handles=legend_handles, loc='upper right', bbox_to_anchor=(1.15, 1))
+    
+    def _create_plot_artists(self):
+        """Create the plot artists once; _update_display only changes their data."""
+        # Everything that moves is animated, so full redraws leave it out of the
+        # cached background and updates only repaint these artists
+        # All obstacles are one collection sized in data units
+        self.obstacle_circles = EllipseCollection([], [], [], units='xy', offsets=np.empty((0, 2)),
+                                                  offset_transform=self.ax.transData, animated=True)
+        self.ax.add_collection(self.obstacle_circles)
+        
+        self.target_lines = LineCollection([], animated=True)
+        self.ax.add_collection(self.target_lines)
+        
+        self.drone_scatter = self.ax.scatter([], [], c='blue', s=100, marker='^',
+                                             zorder=2, animated=True)
+        
+        self.true_rover_scatter = self.ax.scatter([], [], c='green', s=150, marker='s',
+                                                  edgecolors='black', linewidth=2,
+                                                  zorder=2, animated=True)
+        self.true_rover_label = self.ax.annotate('Rover (True)', (0, 0),
+                                                 xytext=(5, 5), textcoords='offset points',
+                                                 fontsize=9, fontweight='bold', animated=True)
+        
+        self.est_rover_scatter = self.ax.scatter([], [], c='orange', s=120, marker='D',
+                                                 edgecolors='black', linewidth=2,
+                                                 alpha=0.8, zorder=2, animated=True)
+        self.est_rover_label = self.ax.annotate('Rover (Est)', (0, 0),
+                                                xytext=(5, -15), textcoords='offset points',
+                                                fontsize=9, fontweight='bold', animated=True)
+        self.error_line, = self.ax.plot([], [], color='purple', linewidth=2, alpha=0.7,
+                                        linestyle='--', animated=True)
+        
+        self.status_text = self.ax.text(0.02, 0.98, '', transform=self.ax.transAxes,
+                                        fontsize=10, verticalalignment='top',
+                                        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8),
+                                        animated=True)
+        
+        # Per-obstacle and per-drone artists, grown on demand and hidden when unused
+        self.obstacle_labels = []
+        self.range_circles = []
+        self.drone_labels = []
+    
+    def _dynamic_artists(self) -> List:
+        """Animated artists in drawing order (hidden ones are skipped when drawn)."""
+        artists = [self.obstacle_circles, *self.obstacle_labels, *self.range_circles,
+                   self.target_lines, self.drone_scatter, *self.drone_labels,
+                   self.true_rover_scatter, self.est_rover_scatter, self.error_line,
+                   self.true_rover_label, self.est_rover_label, self.status_text]
+        # Same stacking as a full (or saved) draw
+        return sorted(artists, key=lambda artist: artist.get_zorder())
+    
+    @staticmethod
+    def _grow_pool(pool: List, count: int, factory) -> List:
+        """Extend an artist pool to count artists and hide the unused tail."""
+        while len(pool) < count:
+            pool.append(factory())
+        for artist in pool[count:]:
+            artist.set_visible(False)
+        return pool[:count]
+    
+    def _new_obstacle_label(self):
+        """Add an obstacle radius label."""
+        return self.ax.text(0, 0, '', ha='center', va='center', fontsize=8, color='white',
+                            fontweight='bold', clip_on=True, animated=True)
+    
+    def _new_range_circle(self):
+        """Add a drone range circle."""
+        circle = plt.Circle((0, 0), 1, linewidth=1, animated=True)
+        self.ax.add_patch(circle)
+        return circle
+    
+    def _new_drone_label(self):
+        """Add a drone id label."""
+        return self.ax.annotate('', (0, 0), xytext=(5, 5), textcoords='offset points',
+                                fontsize=8, fontweight='bold', animated=True)
+    
     def _connect_events(self):
         """Connect mouse events for interaction."""
         self.fig.canvas.mpl_connect('button_press_event', self._on_click)
         self.fig.canvas.mpl_connect('button_release_event', self._on_release)
         self.fig.canvas.mpl_connect('motion_notify_event', self._on_motion)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _on_draw(self, event):
+        """Re-capture the background after a full redraw and paint the animated artists on it."""
+        if event.canvas.is_saving():
+            # Saved figures already include animated artists
+            return
+        
+        if event.canvas.supports_blit:
+            self._background = event.canvas.copy_from_bbox(self.ax.bbox)
+        
+        for artist in self._dynamic_artists():
+            artist.draw(event.renderer)
     
     def _on_click(self, event):
         """Handle mouse click events."""
@@ -134,13 +261,17 @@ class OcclusionSimulation:
         
         x, y = event.xdata, event.ydata
         
-        # Check if clicking on an obstacle
-        for obstacle in self.obstacles:
-            if obstacle.contains_point(x, y):
-                self.selected_obstacle = obstacle
-                obstacle.selected = True
-                self.dragging = True
-                break
+        # Check if clicking on an obstacle, testing every obstacle at once
+        # against an (N, 3) array of centers and radii
+        obstacle_xyr = np.array([(obstacle.x, obstacle.y, obstacle.radius) for obstacle in self.obstacles],
+                                dtype=np.float64).reshape(-1, 3)
+        hits = np.flatnonzero((obstacle_xyr[:, 0] - x)**2 + (obstacle_xyr[:, 1] - y)**2 <= obstacle_xyr[:, 2]**2)
+        
+        if len(hits) > 0:
+            obstacle = self.obstacles[hits[0]]
+            self.selected_obstacle = obstacle
+            obstacle.selected = True
+            self.dragging = True
         else:
             # Deselect all obstacles
             for obstacle in self.obstacles:
@@ -166,17 +297,22 @@ class OcclusionSimulation:
         
         x, y = event.xdata, event.ydata
         self.selected_obstacle.move_to(x, y)
-        self._update_display()
+        
+        # Only the obstacles change until the drag ends; repaint them over the
+        # cached background rather than refreshing the whole display
+        self._update_obstacle_artists()
+        self._blit()
     
     def _randomize_rover(self, event):
         """Randomize rover position."""
         self.rover.randomize_position(-40, 40, -40, 40)
+        self.multilateration_solver.reset()
         self._update_simulation()
     
     def _randomize_drones(self, event):
         """Randomize drone positions."""
-        for drone in self.drones:
-            drone.randomize_position(-50, 50, -50, 50)
+        Drone.randomize_positions(self.drones, -50, 50, -50, 50)
+        self.multilateration_solver.reset()
         self._update_simulation()
     
     def _update_drone_count(self, val):
@@ -184,12 +320,16 @@ class OcclusionSimulation:
         new_count = int(self.slider_drone_count.val)
         current_count = len(self.drones)
         
+        # The slider fires for every small movement; only re-run the simulation
+        # and its console report when the whole drone count actually changes
+        if new_count == current_count:
+            return
+        
         if new_count > current_count:
             # Add drones
-            for i in range(current_count, new_count):
-                drone = Drone(0, 0, drone_id=i)
-                drone.randomize_position(-50, 50, -50, 50)
-                self.drones.append(drone)
+            new_drones = [Drone(0, 0, drone_id=i) for i in range(current_count, new_count)]
+            Drone.randomize_positions(new_drones, -50, 50, -50, 50)
+            self.drones.extend(new_drones)
         elif new_count < current_count:
             # Remove drones
             self.drones = self.drones[:new_count]
@@ -226,12 +366,11 @@ class OcclusionSimulation:
         # Simulate ToF measurements
         rover_pos = self.rover.get_position()
         
-        for drone in self.drones:
-            drone.simulate_tof_measurement(
-                rover_pos[0], rover_pos[1], 
-                obstacles=self.obstacles,
-                noise_std=0.1
-            )
+        Drone.simulate_tof_batch(
+            self.drones, rover_pos[0], rover_pos[1],
+            obstacles=self.obstacles,
+            noise_std=0.1
+        )
         
         # Perform multilateration
         estimated_pos = self.multilateration_solver.solve(self.drones, method='hybrid')
@@ -278,68 +417,102 @@ class OcclusionSimulation:
     
     def _update_display(self):
         """Update the visual display."""
-        self.ax.clear()
-        
-        # Set up the plot
-        self.ax.set_xlim(-60, 60)
-        self.ax.set_ylim(-60, 60)
-        self.ax.set_aspect('equal')
-        self.ax.grid(True, alpha=0.3)
-        self.ax.set_title('Target Occlusion Detection Simulation', fontsize=14, fontweight='bold')
-        self.ax.set_xlabel('X Position (meters)')
-        self.ax.set_ylabel('Y Position (meters)')
-        
         # Plot obstacles
-        for obstacle in self.obstacles:
-            color = 'darkred' if obstacle.selected else 'red'
-            alpha = 0.8 if obstacle.selected else 0.6
-            
-            circle = plt.Circle((obstacle.x, obstacle.y), obstacle.radius, 
-                              color=color, alpha=alpha, label='Obstacles' if obstacle == self.obstacles[0] else "")
-            self.ax.add_patch(circle)
-            
-            # Add obstacle label
-            self.ax.annotate(f'R={obstacle.radius:.1f}', 
-                           (obstacle.x, obstacle.y), 
-                           ha='center', va='center', fontsize=8, color='white', fontweight='bold')
+        self._update_obstacle_artists()
         
-        # Plot drones and their range circles
-        for drone in self.drones:
-            # Plot range circle first (behind drone)
-            drone.plot_range_circle(self.ax)
+        # Plot drones, their range circles and lines to the rover
+        # Drone positions and occlusion flags are gathered once and every
+        # per-drone style below is selected from them with array operations
+        rover_pos = self.rover.get_position()
+        drone_xy = np.array([(drone.x, drone.y) for drone in self.drones], dtype=np.float64)
+        occluded = np.array([drone.is_occluded for drone in self.drones], dtype=bool)
+        occluded_col = occluded[:, np.newaxis]
+        
+        self.drone_scatter.set_offsets(drone_xy)
+        self.drone_scatter.set_edgecolors(np.where(occluded_col, self.DRONE_EDGE_COLORS[1], self.DRONE_EDGE_COLORS[0]))
+        self.drone_scatter.set_linewidths(np.where(occluded, 3, 1))
+        
+        # Each line runs from its drone to the rover
+        segments = np.empty((len(drone_xy), 2, 2))
+        segments[:, 0] = drone_xy
+        segments[:, 1] = rover_pos
+        self.target_lines.set_segments(segments)
+        self.target_lines.set_colors(np.where(occluded_col, self.TARGET_LINE_COLORS[1], self.TARGET_LINE_COLORS[0]))
+        self.target_lines.set_linewidths(np.where(occluded, 2, 1))
+        self.target_lines.set_linestyles([':' if occ else '-' for occ in occluded])
+        
+        circles = self._grow_pool(self.range_circles, len(self.drones), self._new_range_circle)
+        labels = self._grow_pool(self.drone_labels, len(self.drones), self._new_drone_label)
+        for drone, circle, label in zip(self.drones, circles, labels):
+            label.xy = (drone.x, drone.y)
+            label.set_text(f'D{drone.drone_id}')
+            label.set_visible(True)
             
-            # Plot drone
-            drone.plot_drone(self.ax)
+            if drone.measured_distance is None:
+                circle.set_visible(False)
+                continue
             
-            # Plot line to rover
-            rover_pos = self.rover.get_position()
-            drone.plot_line_to_target(self.ax, rover_pos[0], rover_pos[1])
+            # Range circle, in a different style if occluded
+            facecolor, edgecolor, linestyle = self.RANGE_CIRCLE_STYLES[drone.is_occluded]
+            circle.set_center((drone.x, drone.y))
+            circle.set_radius(drone.measured_distance)
+            circle.set_facecolor(facecolor)
+            circle.set_edgecolor(edgecolor)
+            circle.set_linestyle(linestyle)
+            circle.set_visible(True)
         
         # Plot rover
-        self.rover.plot_true_position(self.ax)
-        self.rover.plot_estimated_position(self.ax)
-        self.rover.plot_error_line(self.ax)
-        
-        # Add legend
-        handles, labels = self.ax.get_legend_handles_labels()
-        # Remove duplicate labels
-        unique_labels = []
-        unique_handles = []
-        for handle, label in zip(handles, labels):
-            if label not in unique_labels:
-                unique_labels.append(label)
-                unique_handles.append(handle)
-        
-        self.ax.legend(unique_handles, unique_labels, loc='upper right', bbox_to_anchor=(1.15, 1))
-        
-        # Add status text
-        self._add_status_text()
-        
-        # Refresh canvas
-        self.fig.canvas.draw()
-    
-    def _add_status_text(self):
-        """Add status text to the plot."""
+        self.true_rover_scatter.set_offsets([rover_pos])
+        self.true_rover_label.xy = rover_pos
+        
+        est_x, est_y = self.rover.get_estimated_position()
+        has_estimate = est_x is not None and est_y is not None
+        for artist in (self.est_rover_scatter, self.est_rover_label, self.error_line):
+            artist.set_visible(has_estimate)
+        if has_estimate:
+            self.est_rover_scatter.set_offsets([(est_x, est_y)])
+            self.est_rover_label.xy = (est_x, est_y)
+            self.error_line.set_data([rover_pos[0], est_x], [rover_pos[1], est_y])
+        
+        # Update status text
+        self._update_status_text()
+        
+        # Repaint only the animated artists
+        self._blit()
+    
+    def _update_obstacle_artists(self):
+        """Move the obstacle circles and labels to the current obstacles."""
+        obstacle_xyr = np.array([(obstacle.x, obstacle.y, obstacle.radius) for obstacle in self.obstacles],
+                                dtype=np.float64).reshape(-1, 3)
+        diameters = 2 * obstacle_xyr[:, 2]
+        self.obstacle_circles.set_offsets(obstacle_xyr[:, :2])
+        self.obstacle_circles.set_widths(diameters)
+        self.obstacle_circles.set_heights(diameters)
+        self.obstacle_circles.set_angles(np.zeros(len(diameters)))
+        self.obstacle_circles.set_color([self.OBSTACLE_COLORS[obstacle.selected] for obstacle in self.obstacles])
+        
+        labels = self._grow_pool(self.obstacle_labels, len(self.obstacles), self._new_obstacle_label)
+        for obstacle, label in zip(self.obstacles, labels):
+            # Obstacle label
+            label.set_position((obstacle.x, obstacle.y))
+            label.set_text(f'R={obstacle.radius:.1f}')
+            label.set_visible(True)
+    
+    def _blit(self):
+        """Redraw the animated artists over the cached background."""
+        canvas = self.fig.canvas
+        if self._background is None:
+            # No full redraw to blit onto yet
+            canvas.draw_idle()
+            return
+        
+        canvas.restore_region(self._background)
+        for artist in self._dynamic_artists():
+            self.ax.draw_artist(artist)
+        canvas.blit(self.ax.bbox)
+    
+    def _update_status_text(self):
+        """Update the status text on the plot."""
         status_text = []
         
         # Occlusion status
@@ -358,12 +531,7 @@ class OcclusionSimulation:
             status_text.append(f"Position Error: {error:.3f}m")
         
         # Combine text
-        full_text = "\n".join(status_text)
-        
-        # Add text box
-        self.ax.text(0.02, 0.98, full_text, transform=self.ax.transAxes, 
-                    fontsize=10, verticalalignment='top',
-                    bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+        self.status_text.set_text("\n".join(status_text))
     
     def run(self):
         """Run the simulation."""
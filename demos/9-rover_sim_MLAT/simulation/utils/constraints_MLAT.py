@@ -8,6 +8,7 @@ Based on the mathematical foundations described in multilateration.md
 import numpy as np
 from typing import List, Tuple, Optional
 import math
+from itertools import combinations
 
 # ==============================================================================
 # MULTILATERATION CONSTRAINTS
@@ -77,17 +78,14 @@ class GeometricConstraints:
         if len(positions) < 3:
             return False
         
-        # Check all combinations of three points
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
-                for k in range(j + 1, len(positions)):
-                    area = GeometricConstraints.calculate_triangle_area(
-                        positions[i], positions[j], positions[k]
-                    )
-                    if area < MIN_TRIANGLE_AREA:
-                        return True
-        
-        return False
+        points = np.asarray(positions, dtype=float)
+        
+        # Every 3-subset as one (K, 3) index array; areas from the 2D cross product
+        combos = np.array(list(combinations(range(len(points)), 3)))
+        edges = points[combos[:, 1:]] - points[combos[:, :1]]
+        areas = np.abs(edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0]) / 2.0
+        
+        return bool(np.any(areas < MIN_TRIANGLE_AREA))
     
     @staticmethod
     def check_coplanarity_3d(positions: List[Tuple[float, float, float]]) -> bool:
@@ -103,18 +101,14 @@ class GeometricConstraints:
         if len(positions) < 4:
             return False
         
-        # Check all combinations of four points
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
-                for k in range(j + 1, len(positions)):
-                    for l in range(k + 1, len(positions)):
-                        volume = GeometricConstraints.calculate_tetrahedron_volume(
-                            positions[i], positions[j], positions[k], positions[l]
-                        )
-                        if volume < MIN_TETRAHEDRON_VOLUME:
-                            return True
-        
-        return False
+        points = np.asarray(positions, dtype=float)
+        
+        # Every 4-subset as one (K, 4) index array; volumes = |det(v1, v2, v3)| / 6 batched
+        combos = np.array(list(combinations(range(len(points)), 4)))
+        edges = points[combos[:, 1:]] - points[combos[:, :1]]
+        volumes = np.abs(np.linalg.det(edges)) / 6.0
+        
+        return bool(np.any(volumes < MIN_TETRAHEDRON_VOLUME))
     
     @staticmethod
     def calculate_triangle_area(p1: Tuple[float, float], 
@@ -219,15 +213,15 @@ class GeometricConstraints:
         Returns:
             True if anchors are properly separated, False otherwise
         """
-        for i in range(len(anchor_positions)):
-            for j in range(i + 1, len(anchor_positions)):
-                distance = np.linalg.norm(
-                    np.array(anchor_positions[i]) - np.array(anchor_positions[j])
-                )
-                if distance < MIN_DRONE_SEPARATION:
-                    return False
+        positions = np.asarray(anchor_positions, dtype=float)
+        if len(positions) < 2:
+            return True
         
-        return True
+        # All pairwise separations at once; ignore each anchor's distance to itself
+        separations = np.linalg.norm(positions[:, np.newaxis, :] - positions[np.newaxis, :, :], axis=2)
+        np.fill_diagonal(separations, np.inf)
+        
+        return bool(separations.min() >= MIN_DRONE_SEPARATION)
     
     @staticmethod
     def validate_distance_separation(distances: List[float]) -> bool:
@@ -240,12 +234,10 @@ class GeometricConstraints:
         Returns:
             True if distances are properly separated, False otherwise
         """
-        for i in range(len(distances)):
-            for j in range(i + 1, len(distances)):
-                if abs(distances[i] - distances[j]) < MIN_DISTANCE_SEPARATION:
-                    return False
+        # Sorted neighbours hold the smallest pairwise differences
+        gaps = np.diff(np.sort(np.asarray(distances, dtype=float)))
         
-        return True
+        return bool(np.all(gaps >= MIN_DISTANCE_SEPARATION))
     
     @staticmethod
     def validate_signal_constraints(distances: List[float], 
@@ -14,8 +14,7 @@ from simulation.utils.constraints_MLAT import (
     MAX_ITERATIONS,
     CONVERGENCE_THRESHOLD,
     LEAST_SQUARES_REGULARIZATION,
-    MIN_TRIANGLE_AREA,
-    MIN_TETRAHEDRON_VOLUME
+    GeometricConstraints
 )
 
 # ==============================================================================
@@ -124,18 +123,8 @@ def check_collinearity_2d(positions: List[Tuple[float, float]]) -> bool:
     Returns:
         True if points are collinear (bad geometry), False otherwise
     """
-    if len(positions) < 3:
-        return False
-    
-    # Check all combinations of three points
-    for i in range(len(positions)):
-        for j in range(i + 1, len(positions)):
-            for k in range(j + 1, len(positions)):
-                area = calculate_triangle_area(positions[i], positions[j], positions[k])
-                if area < MIN_TRIANGLE_AREA:
-                    return True
-    
-    return False
+    # Single implementation of the 3-subset sweep, shared with input validation
+    return GeometricConstraints.check_collinearity_2d(positions)
 
 
 def circle_circle_intersection(center1: Tuple[float, float], 
@@ -182,6 +171,41 @@ def circle_circle_intersection(center1: Tuple[float, float],
     return [p1, p2]
 
 
+def circle_circle_intersections(positions: List[Tuple[float, float]],
+                                distances: List[float]) -> np.ndarray:
+    """
+    Calculate intersection points of every pair of circles at once.
+    
+    Args:
+        positions: List of circle centers (x, y)
+        distances: List of circle radii
+        
+    Returns:
+        (M, 2) array of intersection points, two per intersecting pair in (i, j) pair order
+    """
+    centers = np.asarray(positions, dtype=float)
+    radii = np.asarray(distances, dtype=float)
+    i, j = np.triu_indices(len(centers), k=1)
+    
+    diff = centers[j] - centers[i]
+    d = np.hypot(diff[:, 0], diff[:, 1])
+    r1, r2 = radii[i], radii[j]
+    
+    # Same intersection conditions as circle_circle_intersection; only
+    # intersecting pairs are carried into the point computation
+    valid = (d <= r1 + r2) & (d >= np.abs(r1 - r2)) & (d != 0)
+    i, diff, d, r1, r2 = i[valid], diff[valid], d[valid], r1[valid], r2[valid]
+    
+    a = (r1**2 - r2**2 + d**2) / (2 * d)
+    h = np.sqrt(np.maximum(r1**2 - a**2, 0.0))
+    
+    # Midpoint between intersections and perpendicular offset
+    midpoints = centers[i] + (a / d)[:, np.newaxis] * diff
+    offsets = (h / d)[:, np.newaxis] * np.column_stack((-diff[:, 1], diff[:, 0]))
+    
+    return np.stack((midpoints + offsets, midpoints - offsets), axis=1).reshape(-1, 2)
+
+
 def generate_optimal_2d_positions(center: Tuple[float, float],
                                  radius: float,
                                  num_anchors: int) -> List[Tuple[float, float]]:
@@ -253,21 +277,8 @@ def check_coplanarity_3d(positions: List[Tuple[float, float, float]]) -> bool:
     Returns:
         True if points are coplanar (bad geometry), False otherwise
     """
-    if len(positions) < 4:
-        return False
-    
-    # Check all combinations of four points
-    for i in range(len(positions)):
-        for j in range(i + 1, len(positions)):
-            for k in range(j + 1, len(positions)):
-                for l in range(k + 1, len(positions)):
-                    volume = calculate_tetrahedron_volume(
-                        positions[i], positions[j], positions[k], positions[l]
-                    )
-                    if volume < MIN_TETRAHEDRON_VOLUME:
-                        return True
-    
-    return False
+    # Single implementation of the 4-subset sweep, shared with input validation
+    return GeometricConstraints.check_coplanarity_3d(positions)
 
 
 def sphere_sphere_intersection(center1: Tuple[float, float, float], 
@@ -305,6 +316,39 @@ def sphere_sphere_intersection(center1: Tuple[float, float, float],
     return circle_center, normal, h, d
 
 
+def sphere_sphere_intersections(positions: List[Tuple[float, float, float]],
+                                distances: List[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the intersection circles of every pair of spheres at once.
+    
+    Args:
+        positions: List of sphere centers (x, y, z)
+        distances: List of sphere radii
+        
+    Returns:
+        Tuple of (circle_centers, normal_vectors, circle_radii) arrays for the
+        pairs that intersect, in (i, j) pair order
+    """
+    centers = np.asarray(positions, dtype=float)
+    radii = np.asarray(distances, dtype=float)
+    i, j = np.triu_indices(len(centers), k=1)
+    
+    diff = centers[j] - centers[i]
+    d = np.linalg.norm(diff, axis=1)
+    r1, r2 = radii[i], radii[j]
+    
+    # Same intersection conditions as sphere_sphere_intersection, applied per pair
+    valid = (d <= r1 + r2) & (d >= np.abs(r1 - r2)) & (d > 0)
+    diff, d, r1, r2 = diff[valid], d[valid], r1[valid], r2[valid]
+    
+    a = (r1**2 - r2**2 + d**2) / (2 * d)
+    h = np.sqrt(np.maximum(r1**2 - a**2, 0.0))
+    normals = diff / d[:, np.newaxis]
+    circle_centers = centers[i[valid]] + a[:, np.newaxis] * normals
+    
+    return circle_centers, normals, h
+
+
 def generate_optimal_3d_positions(center: Tuple[float, float, float],
                                  radius: float,
                                  num_anchors: int) -> List[Tuple[float, float, float]]:
@@ -400,36 +444,21 @@ def solve_2d_geometric_intersection(positions: List[Tuple[float, float]],
     Returns:
         Estimated target position or None if no solution found
     """
-    intersections = []
-    
-    # Generate all pairwise circle intersections
-    for i in range(len(positions)):
-        for j in range(i + 1, len(positions)):
-            points = circle_circle_intersection(
-                positions[i], distances[i],
-                positions[j], distances[j]
-            )
-            intersections.extend(points)
+    # Generate all pairwise circle intersections in one batch
+    intersections = circle_circle_intersections(positions, distances)
     
-    if not intersections:
+    if len(intersections) == 0:
         return None
     
-    # Find point with maximum circle intersections
-    best_point = None
-    max_count = 0
+    # Find point with maximum circle intersections, from one candidate-to-anchor
+    # range matrix instead of a distance call per candidate and anchor
+    anchors = np.asarray(positions, dtype=float)
+    ranges = np.linalg.norm(intersections[:, np.newaxis, :] - anchors[np.newaxis, :, :], axis=2)
+    counts = np.sum(np.abs(ranges - np.asarray(distances, dtype=float)) <= MULTILATERATION_TOLERANCE, axis=1)
     
-    for point in intersections:
-        count = sum(
-            abs(euclidean_distance(point, positions[k]) - distances[k]) 
-            <= MULTILATERATION_TOLERANCE
-            for k in range(len(positions))
-        )
-        if count > max_count:
-            max_count = count
-            best_point = point
-    
-    if best_point is not None and max_count >= 3:
-        return best_point
+    best = int(np.argmax(counts))
+    if counts[best] >= 3:
+        return tuple(intersections[best].tolist())
     else:
         return None
 
@@ -446,23 +475,14 @@ def solve_3d_geometric_intersection(positions: List[Tuple[float, float, float]],
     Returns:
         Estimated target position or None if no solution found
     """
-    # Generate sphere-sphere intersection circles
-    intersection_planes = []
+    # Generate sphere-sphere intersection circles for all pairs in one batch
+    circle_centers, normals, radii = sphere_sphere_intersections(positions, distances)
     
-    for i in range(len(positions)):
-        for j in range(i + 1, len(positions)):
-            circle_center, normal, radius, d = sphere_sphere_intersection(
-                positions[i], distances[i],
-                positions[j], distances[j]
-            )
-            if circle_center is not None:
-                intersection_planes.append((circle_center, normal, radius))
-    
-    if len(intersection_planes) < 3:
+    if len(normals) < 3:
         return None
     
     # Solve system of plane equations
-    return solve_plane_intersection_system(intersection_planes)
+    return solve_plane_intersection_system(list(zip(circle_centers, normals, radii)))
 
 
 def solve_plane_intersection_system(intersection_planes: List[Tuple[np.ndarray, np.ndarray, float]]) -> Optional[Tuple[float, float, float]]:
@@ -475,21 +495,15 @@ def solve_plane_intersection_system(intersection_planes: List[Tuple[np.ndarray,
     Returns:
         Intersection point or None if no solution
     """
-    A = []
-    b = []
-    
-    for circle_center, normal, radius in intersection_planes:
-        # Plane equation: normal · (x - circle_center) = 0
-        # Rearranged: normal · x = normal · circle_center
-        A.append(normal.tolist())
-        b.append(np.dot(normal, circle_center))
-    
-    if len(A) < 3:
+    if len(intersection_planes) < 3:
         return None
     
     try:
-        A_np = np.array(A)
-        b_np = np.array(b)
+        # Plane equation: normal · (x - circle_center) = 0
+        # Rearranged: normal · x = normal · circle_center, one row per plane
+        A_np = np.array([normal for _, normal, _ in intersection_planes], dtype=float)
+        centers = np.array([circle_center for circle_center, _, _ in intersection_planes], dtype=float)
+        b_np = np.einsum('ij,ij->i', A_np, centers)
         
         # Solve using least squares: x = (A^T A)^-1 A^T b
         ATA = np.dot(A_np.T, A_np)
@@ -505,6 +519,39 @@ def solve_plane_intersection_system(intersection_planes: List[Tuple[np.ndarray,
         return None
 
 
+def linearized_initial_guess(positions: List[Tuple[float, ...]], 
+                             distances: List[float]) -> Optional[Tuple[float, ...]]:
+    """
+    Estimate target position by subtracting the first range equation from the rest.
+    
+    Args:
+        positions: List of anchor positions
+        distances: List of distances from anchors to target
+        
+    Returns:
+        Linear least squares position estimate or None if underdetermined
+    """
+    P = np.asarray(positions, dtype=float)
+    r = np.asarray(distances, dtype=float)
+    
+    if len(P) < P.shape[1] + 1:
+        return None
+    
+    # |x - p_i|^2 - |x - p_0|^2 = r_i^2 - r_0^2 is linear in x
+    A = 2 * (P[1:] - P[0])
+    b = (r[0]**2 - r[1:]**2) - (np.sum(P[0]**2) - np.sum(P[1:]**2, axis=1))
+    
+    try:
+        x0, _, rank, _ = np.linalg.lstsq(A, b, rcond=None)
+    except np.linalg.LinAlgError:
+        return None
+    
+    if rank < P.shape[1]:
+        return None
+    
+    return tuple(x0)
+
+
 def solve_least_squares_optimization(positions: List[Tuple[float, ...]], 
                                     distances: List[float]) -> Optional[Tuple[float, ...]]:
     """
@@ -517,22 +564,33 @@ def solve_least_squares_optimization(positions: List[Tuple[float, ...]],
     Returns:
         Estimated target position or None if optimization fails
     """
-    # Initial guess: centroid of anchor positions
-    initial_guess = calculate_centroid(positions)
+    # Initial guess: closed-form linearized solution when the system is
+    # determined, centroid of anchor positions otherwise
+    initial_guess = linearized_initial_guess(positions, distances)
+    if initial_guess is None:
+        initial_guess = calculate_centroid(positions)
+    
+    anchors = np.asarray(positions, dtype=float)
+    ranges = np.asarray(distances, dtype=float)
     
     # Define objective function
     def objective(point):
-        return [
-            euclidean_distance(point, positions[i]) - distances[i]
-            for i in range(len(positions))
-        ]
+        return np.linalg.norm(anchors - point, axis=1) - ranges
+    
+    # Analytic Jacobian: unit vectors from each anchor towards the point
+    def jacobian(point):
+        diff = point - anchors
+        norms = np.linalg.norm(diff, axis=1, keepdims=True)
+        return diff / np.where(norms > 0, norms, 1.0)
     
     # Solve using least squares
     try:
         result = least_squares(
             objective,
             initial_guess,
+            jac=jacobian,
             method='lm',
+            x_scale='jac',
             max_nfev=MAX_ITERATIONS,
             ftol=CONVERGENCE_THRESHOLD,
             xtol=CONVERGENCE_THRESHOLD
@@ -551,6 +609,15 @@ def solve_least_squares_optimization(positions: List[Tuple[float, ...]],
 # ERROR CALCULATION UTILITIES
 # ==============================================================================
 
+def _range_residuals(positions: List[Tuple[float, ...]], 
+                     distances: List[float], 
+                     point: Tuple[float, ...]) -> np.ndarray:
+    """Distance from point to every anchor minus the measured distance, as one array."""
+    point = np.asarray(point, dtype=float)
+    anchors = np.asarray(positions, dtype=float).reshape(-1, point.size)
+    return np.linalg.norm(anchors - point, axis=1) - np.asarray(distances, dtype=float)
+
+
 def calculate_positioning_error(positions: List[Tuple[float, ...]], 
                                distances: List[float], 
                                estimated_pos: Tuple[float, ...]) -> float:
@@ -565,13 +632,10 @@ def calculate_positioning_error(positions: List[Tuple[float, ...]],
     Returns:
         RMS positioning error
     """
-    errors = []
-    for i, (pos, dist) in enumerate(zip(positions, distances)):
-        calculated_dist = euclidean_distance(estimated_pos, pos)
-        error = abs(calculated_dist - dist)
-        errors.append(error)
-    
-    return calculate_rms_error(errors)
+    residuals = _range_residuals(positions, distances, estimated_pos)
+    if residuals.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(residuals**2)))
 
 
 def calculate_residuals(positions: List[Tuple[float, ...]], 
@@ -588,13 +652,7 @@ def calculate_residuals(positions: List[Tuple[float, ...]],
     Returns:
         List of residual errors for each anchor
     """
-    residuals = []
-    for i, (pos, dist) in enumerate(zip(positions, distances)):
-        calculated_dist = euclidean_distance(estimated_pos, pos)
-        residual = calculated_dist - dist
-        residuals.append(residual)
-    
-    return residuals
+    return _range_residuals(positions, distances, estimated_pos).tolist()
 
 
 # ==============================================================================
@@ -658,12 +716,8 @@ def check_solution_validity(positions: List[Tuple[float, ...]],
     Returns:
         True if solution is valid, False otherwise
     """
-    for i, (pos, expected_dist) in enumerate(zip(positions, distances)):
-        calculated_dist = euclidean_distance(solution, pos)
-        if abs(calculated_dist - expected_dist) > tolerance:
-            return False
-    
-    return True
+    residuals = _range_residuals(positions, distances, solution)
+    return not np.any(np.abs(residuals) > tolerance)
 
 
 # ==============================================================================